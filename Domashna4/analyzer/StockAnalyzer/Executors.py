@@ -0,0 +1,160 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from technical_analysis import TechnicalAnalyzer
+
+IO_WORKERS = int(os.getenv('ANALYZER_IO_WORKERS', '8'))
+CPU_WORKERS = int(os.getenv('ANALYZER_CPU_WORKERS', str(min(4, os.cpu_count() or 1))))
+
+# Requests of one endpoint allowed to run at once; the rest wait their turn.
+# LSTMAnalyzer swaps its model and scalers per prediction, so it runs alone.
+ENDPOINT_LIMITS = {
+    'nlp': 2,
+    'technical': 8,
+    'technical_all': 2,
+    'technical_refresh': 1,
+    'lstm': 1
+}
+
+
+def _timed_call(func: Callable, args: tuple):
+    # Runs in the worker; the wall clock start tells the caller how long it queued
+    started = time.time()
+    return started, func(*args)
+
+
+# Built once per spawned worker by init_worker and reused by all its tasks
+_worker_analyzer: Optional[TechnicalAnalyzer] = None
+
+
+def init_worker() -> None:
+    # The analyzer's DataStorage runs the schema DDL and opens the worker's
+    # connection pool, which should happen once and not on every task
+    global _worker_analyzer
+    _worker_analyzer = TechnicalAnalyzer()
+
+
+# Process pool tasks, module level so spawned workers can import them
+def analyze_all_technical() -> Dict[str, Any]:
+    return _worker_analyzer.analyze_all()
+
+
+def refresh_technical_signals() -> int:
+    return _worker_analyzer.refresh_signals()
+
+
+class EndpointMetrics:
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.semaphore = asyncio.Semaphore(limit)
+        self._lock = threading.Lock()
+        self._values = {
+            'calls': 0, 'errors': 0, 'waiting': 0, 'running': 0,
+            'queue_seconds': 0.0, 'max_queue_seconds': 0.0, 'run_seconds': 0.0,
+            'process_tasks': 0, 'process_queue_seconds': 0.0
+        }
+
+    def add(self, name: str, amount: float) -> None:
+        with self._lock:
+            self._values[name] += amount
+
+    def record(self, queued: float, ran: float, failed: bool) -> None:
+        with self._lock:
+            self._values['calls'] += 1
+            self._values['errors'] += int(failed)
+            self._values['queue_seconds'] += queued
+            self._values['max_queue_seconds'] = max(self._values['max_queue_seconds'], queued)
+            self._values['run_seconds'] += ran
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            values = dict(self._values)
+        calls = values['calls']
+        return {
+            'limit': self.limit,
+            'calls': calls,
+            'errors': values['errors'],
+            'waiting': values['waiting'],
+            'running': values['running'],
+            'avg_queue_ms': values['queue_seconds'] / calls * 1000 if calls else 0.0,
+            'max_queue_ms': values['max_queue_seconds'] * 1000,
+            'avg_run_ms': values['run_seconds'] / calls * 1000 if calls else 0.0,
+            'avg_process_queue_ms': (
+                values['process_queue_seconds'] / values['process_tasks'] * 1000
+                if values['process_tasks'] else 0.0
+            )
+        }
+
+
+class Executors:
+    """
+    Keeps blocking endpoint work off the event loop. Every request holds its
+    endpoint's semaphore and runs on the thread pool (database, HTTP, model
+    inference); CPU-bound pandas work is handed on to a spawned process pool
+    from there. Queue time counts from the request's arrival until its work
+    starts on a thread, covering the semaphore and the thread pool backlog;
+    the wait for a free process is reported separately.
+
+    Only the all-issuer technical work (seconds of pandas) goes to processes.
+    Per-issuer technical requests are mostly a read of the stored signals and
+    otherwise an incremental update of some 15 ms; an LSTM forecast is about
+    35 ms on the NumPy runtime, with its model kept by the parent's lazily
+    loaded subsystem and the endpoint limited to one request at a time. For
+    those, shipping the request and result to another process and holding a
+    model per worker would cost about as much as the GIL time it saves.
+    """
+    def __init__(self, io_workers: int = IO_WORKERS, cpu_workers: int = CPU_WORKERS):
+        self.thread_pool = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix='analyzer-io')
+        # spawn, not fork: the parent holds database connections and model threads
+        self.process_pool = ProcessPoolExecutor(
+            max_workers=cpu_workers, mp_context=multiprocessing.get_context('spawn'),
+            initializer=init_worker
+        )
+        # Limits can be overridden per endpoint, e.g. ANALYZER_LIMIT_NLP=1
+        self.endpoints = {
+            name: EndpointMetrics(int(os.getenv(f'ANALYZER_LIMIT_{name.upper()}', limit)))
+            for name, limit in ENDPOINT_LIMITS.items()
+        }
+
+    async def run(self, endpoint: str, func: Callable, *args) -> Any:
+        """Runs func(*args) on the thread pool within the endpoint's concurrency limit."""
+        metrics = self.endpoints[endpoint]
+        submitted = time.time()
+        metrics.add('waiting', 1)
+        async with metrics.semaphore:
+            metrics.add('waiting', -1)
+            metrics.add('running', 1)
+            started, failed = None, True
+            try:
+                loop = asyncio.get_running_loop()
+                started, result = await loop.run_in_executor(self.thread_pool, _timed_call, func, args)
+                failed = False
+                return result
+            finally:
+                metrics.add('running', -1)
+                started = started or time.time()
+                metrics.record(started - submitted, time.time() - started, failed)
+
+    def run_cpu(self, endpoint: str, func: Callable, *args) -> Any:
+        """
+        Runs a module level function on the process pool and waits for it; called
+        from work already running on the thread pool.
+        """
+        metrics = self.endpoints[endpoint]
+        submitted = time.time()
+        started, result = self.process_pool.submit(_timed_call, func, args).result()
+        metrics.add('process_tasks', 1)
+        metrics.add('process_queue_seconds', started - submitted)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: metrics.snapshot() for name, metrics in self.endpoints.items()}
+
+    def shutdown(self) -> None:
+        self.thread_pool.shutdown(wait=False, cancel_futures=True)
+        self.process_pool.shutdown(wait=False, cancel_futures=True)
@@ -1,9 +1,10 @@
 import os
+import threading
 import joblib
-from tensorflow.keras.models import load_model
 import json
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Tuple, Optional
+from lstm_runtime import NPZ_NAME, NumpyLSTMModel, export_npz, file_digest
 
 # Singleton Pattern for ModelStorage
 class ModelStorage:
@@ -20,6 +21,9 @@ class ModelStorage:
             self.base_path = base_path
             self._storage_strategy = FileSystemStorageStrategy()
             os.makedirs(base_path, exist_ok=True)
+            # model_name -> (signature of the saved files, load_model result)
+            self._loaded: Dict[str, Tuple[Any, Tuple]] = {}
+            self._load_lock = threading.Lock()
             self._initialized = True
 
     # Factory Method Pattern
@@ -49,6 +53,18 @@ class ModelStorage:
         """Maintains the same interface but delegates to strategy"""
         return self._storage_strategy.load_model(self.base_path, model_name)
 
+    def get_model(self, model_name: str = 'stock_prediction') -> Tuple:
+        """
+        Same tuple as load_model, but deserialized once and kept in memory. It is
+        loaded again only when the saved files have changed since (new mtime or size).
+        """
+        signature = self._storage_strategy.model_signature(self.base_path, model_name)
+        with self._load_lock:
+            cached = self._loaded.get(model_name)
+            if cached is None or cached[0] != signature:
+                self._loaded[model_name] = (signature, self.load_model(model_name))
+            return self._loaded[model_name][1]
+
     def list_saved_models(self) -> List[str]:
         """Maintains the same interface but delegates to strategy"""
         return self._storage_strategy.list_saved_models(self.base_path)
@@ -69,6 +85,10 @@ class StorageStrategy(ABC):
     def list_saved_models(self, base_path: str) -> List[str]:
         pass
 
+    @abstractmethod
+    def model_signature(self, base_path: str, model_name: str) -> Any:
+        pass
+
 class FileSystemStorageStrategy(StorageStrategy):
     def save_model(self, base_path: str, model: Any, volume_scaler: Any,
                   price_scaler: Any, binary_encoder: Any, model_name: str,
@@ -79,6 +99,8 @@ class FileSystemStorageStrategy(StorageStrategy):
         # Save model
         model_path = os.path.join(model_dir, 'model.keras')
         model.save(model_path)
+        # Weights for the NumPy runtime, so serving doesn't need TensorFlow
+        export_npz(model, os.path.join(model_dir, NPZ_NAME), source_path=model_path)
 
         # Save scalers and encoder
         joblib.dump(price_scaler, os.path.join(model_dir, 'price_scaler.pkl'))
@@ -94,9 +116,23 @@ class FileSystemStorageStrategy(StorageStrategy):
     def load_model(self, base_path: str, model_name: str) -> Tuple:
         model_dir = os.path.join(base_path, model_name)
         
-        # Load model
-        model = load_model(os.path.join(model_dir, 'model.keras'))
-        
+        # Load model: the NumPy export save_model writes next to model.keras, as
+        # long as it was exported from this very model.keras (same size and sha1).
+        # A model.keras copied in without save_model, or an export without a
+        # recorded digest, is loaded with Keras and exported again
+        keras_path = os.path.join(model_dir, 'model.keras')
+        npz_path = os.path.join(model_dir, NPZ_NAME)
+        model = NumpyLSTMModel.load(npz_path) if os.path.exists(npz_path) else None
+        if model is not None and os.path.exists(keras_path) and model.source != file_digest(keras_path):
+            model = None
+        if model is None:
+            from tensorflow.keras.models import load_model
+            model = load_model(keras_path)
+            try:
+                export_npz(model, npz_path, source_path=keras_path)
+            except (OSError, ValueError) as e:
+                print(f"Could not export {npz_path}, serving the Keras model: {e}")
+
         # Load scalers and encoder
         price_scaler = joblib.load(os.path.join(model_dir, 'price_scaler.pkl'))
         volume_scaler = joblib.load(os.path.join(model_dir, 'volume_scaler.pkl'))
@@ -115,4 +151,14 @@ class FileSystemStorageStrategy(StorageStrategy):
         if not os.path.exists(base_path):
             return []
         return [d for d in os.listdir(base_path)
-                if os.path.isdir(os.path.join(base_path, d))]
\ No newline at end of file
+                if os.path.isdir(os.path.join(base_path, d))]
+
+    def model_signature(self, base_path: str, model_name: str) -> Tuple:
+        model_dir = os.path.join(base_path, model_name)
+        if not os.path.isdir(model_dir):
+            return ()
+        signature = []
+        for name in sorted(os.listdir(model_dir)):
+            stat = os.stat(os.path.join(model_dir, name))
+            signature.append((name, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
@@ -0,0 +1,148 @@
+import json
+import os
+import threading
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from DataStorage import DataStorage
+
+# Next to this module rather than the working directory, so running the analyzer
+# or a benchmark from elsewhere does not scatter caches; ignored by git and docker
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'prices')
+
+# Columns of issuer_data after date and issuer, in table order
+PRICE_COLUMNS = [
+    'avg_price', 'last_trade_price', 'max_price', 'min_price', 'percent_change',
+    'turnover_best', 'total_turnover', 'volume'
+]
+HISTORY_DTYPE = np.dtype([('date', 'datetime64[D]')] + [(name, 'f8') for name in PRICE_COLUMNS])
+
+
+# Singleton Pattern for the local price history cache
+class PriceHistoryCache:
+    """
+    Keeps each issuer's history as a memory-mapped NumPy file next to a small
+    JSON sidecar recording the issuer_dates.last_date it was synced to. A read
+    costs one issuer_dates lookup; only rows newer than the cached ones are
+    fetched from Postgres when the scraper has moved the issuer forward.
+    """
+    _instance = None
+
+    def __new__(cls, storage: Optional[DataStorage] = None, cache_dir: Optional[str] = None):
+        if cls._instance is None:
+            cls._instance = super(PriceHistoryCache, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self, storage: Optional[DataStorage] = None, cache_dir: Optional[str] = None):
+        if self._initialized:
+            return
+
+        self.storage = storage or DataStorage()
+        self.cache_dir = cache_dir or os.getenv('PRICE_CACHE_DIR', DEFAULT_CACHE_DIR)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._initialized = True
+
+    def get_history(self, issuer: str, columns: List[str], limit_last: Optional[int] = None) -> pd.DataFrame:
+        """
+        Same rows as DataStorage.get_by_issuer, as a DataFrame whose columns are
+        labelled positionally with `columns` (date, issuer, then the price columns).
+        """
+        synced_to = self.storage.get_issuer_date(issuer)
+        if synced_to is None:
+            # Issuers the scraper has not registered yet are not cached
+            rows = self.storage.get_by_issuer(issuer, limit_last=limit_last)
+            return pd.DataFrame(rows, columns=columns)
+
+        with self._lock_for(issuer):
+            history = self._refresh(issuer, synced_to)
+
+        if limit_last is not None:
+            history = history[-limit_last:]
+        return self._to_frame(issuer, history, columns)
+
+    def invalidate(self, issuer: Optional[str] = None) -> None:
+        """Drops the cached history of one issuer, or of all of them."""
+        issuers = [issuer] if issuer else [
+            name[:-len('.npy')] for name in os.listdir(self.cache_dir) if name.endswith('.npy')
+        ]
+        for name in issuers:
+            with self._lock_for(name):
+                for path in (self._data_path(name), self._meta_path(name)):
+                    if os.path.exists(path):
+                        os.remove(path)
+
+    def _refresh(self, issuer: str, synced_to: date) -> np.ndarray:
+        history = self._load(issuer)
+        if history is not None and self._synced_to(issuer) == synced_to.isoformat():
+            return history
+
+        since = None
+        if history is not None and len(history):
+            since = history['date'][-1].item() + timedelta(days=1)
+        rows = self.storage.get_by_issuer(issuer, since=since)
+
+        fresh = self._to_array(rows)
+        history = fresh if history is None else np.concatenate([history, fresh])
+        self._store(issuer, history, synced_to)
+        mapped = self._load(issuer)
+        # NumPy refuses to memory-map an empty array
+        return mapped if mapped is not None else history
+
+    def _load(self, issuer: str) -> Optional[np.ndarray]:
+        path = self._data_path(issuer)
+        if not os.path.exists(path):
+            return None
+        try:
+            return np.load(path, mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, issuer: str, history: np.ndarray, synced_to: date) -> None:
+        # Written to temporary files and renamed so readers never see a partial file
+        data_tmp = f"{self._data_path(issuer)}.{os.getpid()}.tmp"
+        with open(data_tmp, 'wb') as f:
+            np.save(f, history)
+        os.replace(data_tmp, self._data_path(issuer))
+
+        meta_tmp = f"{self._meta_path(issuer)}.{os.getpid()}.tmp"
+        with open(meta_tmp, 'w') as f:
+            json.dump({'synced_to': synced_to.isoformat(), 'rows': len(history)}, f)
+        os.replace(meta_tmp, self._meta_path(issuer))
+
+    def _synced_to(self, issuer: str) -> Optional[str]:
+        try:
+            with open(self._meta_path(issuer)) as f:
+                return json.load(f).get('synced_to')
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _to_array(rows: List[tuple]) -> np.ndarray:
+        history = np.empty(len(rows), dtype=HISTORY_DTYPE)
+        if rows:
+            history['date'] = [row[0] for row in rows]
+            for offset, name in enumerate(PRICE_COLUMNS, start=2):
+                history[name] = [np.nan if row[offset] is None else row[offset] for row in rows]
+        return history
+
+    @staticmethod
+    def _to_frame(issuer: str, history: np.ndarray, columns: List[str]) -> pd.DataFrame:
+        frame = {columns[0]: history['date'], columns[1]: issuer}
+        frame.update({label: history[name] for label, name in zip(columns[2:], PRICE_COLUMNS)})
+        return pd.DataFrame(frame, index=pd.RangeIndex(len(history)), columns=columns)
+
+    def _lock_for(self, issuer: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(issuer, threading.Lock())
+
+    def _data_path(self, issuer: str) -> str:
+        return os.path.join(self.cache_dir, f"{issuer}.npy")
+
+    def _meta_path(self, issuer: str) -> str:
+        return os.path.join(self.cache_dir, f"{issuer}.json")
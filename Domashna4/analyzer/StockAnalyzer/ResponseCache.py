@@ -0,0 +1,87 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+# Singleton Pattern for the analyzer's response cache
+class ResponseCache:
+    """
+    Bounded LRU cache of endpoint responses keyed by (endpoint, issuer, params).
+    Every entry remembers the data version it was computed for (the issuer's
+    issuer_dates.last_date for price based endpoints) and is recomputed once
+    the version moves on; entries with a TTL (news) also expire by age.
+    """
+    _instance = None
+
+    def __new__(cls, max_entries: Optional[int] = None):
+        if cls._instance is None:
+            cls._instance = super(ResponseCache, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self, max_entries: Optional[int] = None):
+        if self._initialized:
+            return
+
+        self.max_entries = max_entries or int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '512'))
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'stale': 0, 'expired': 0, 'evictions': 0, 'invalidations': 0}
+        self._initialized = True
+
+    def get_or_compute(self, endpoint: str, issuer: Optional[str], params: Tuple, version: Hashable,
+                       compute: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """
+        Cached response for the key when it was computed for `version` and has
+        not expired, otherwise the result of `compute()`, which is then cached.
+        Exceptions from `compute` propagate and nothing is cached.
+        """
+        key = (endpoint, issuer, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_version, expires_at, value = entry
+                if entry_version != version:
+                    self._stats['stale'] += 1
+                elif expires_at is not None and expires_at <= time.monotonic():
+                    self._stats['expired'] += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return value
+            self._stats['misses'] += 1
+
+        # Computed outside the lock so slow endpoints don't serialize each other
+        value = compute()
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (version, expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+        return value
+
+    def invalidate(self, issuer: Optional[str] = None, endpoint: Optional[str] = None) -> int:
+        """Drops the entries of one issuer and/or endpoint, or all of them. Returns how many."""
+        with self._lock:
+            keys = [
+                key for key in self._entries
+                if (issuer is None or key[1] == issuer) and (endpoint is None or key[0] == endpoint)
+            ]
+            for key in keys:
+                del self._entries[key]
+            self._stats['invalidations'] += len(keys)
+            return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            return {
+                **self._stats,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hit_rate': self._stats['hits'] / lookups if lookups else 0.0
+            }
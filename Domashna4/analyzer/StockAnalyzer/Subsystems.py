@@ -0,0 +1,103 @@
+import os
+import threading
+import time
+import traceback
+from typing import Any, Callable, Dict, List, Optional
+
+# Loaded in the background right after startup; ANALYZER_WARMUP= (empty) turns
+# that off and leaves every subsystem to load on its first request
+WARMUP = [name for name in os.getenv('ANALYZER_WARMUP', 'lstm,nlp').split(',') if name]
+
+
+# The imports stay inside the factories: nlp pulls in transformers/torch and
+# downloads FinBERT, lstm pandas/sklearn and the model bundle
+def create_nlp_processor() -> Any:
+    from nlp import NLPProcessor
+    return NLPProcessor()
+
+
+def create_lstm_analyzer() -> Any:
+    from lstm import LSTMAnalyzer
+    analyzer = LSTMAnalyzer()
+    # Puts the model bundle in ModelStorage's cache before the first forecast
+    analyzer.use_saved_model()
+    return analyzer
+
+
+SUBSYSTEMS = {
+    'nlp': create_nlp_processor,
+    'lstm': create_lstm_analyzer
+}
+
+
+class LazySubsystem:
+    """
+    Builds its instance once, on the first get(); concurrent callers wait for
+    that load instead of starting their own. A failed load is reported and
+    retried on the next get().
+    """
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        self.name = name
+        self.factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+        self.state = 'not_loaded'
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == 'ready'
+
+    def get(self) -> Any:
+        if self._instance is not None:
+            return self._instance
+        with self._lock:
+            if self._instance is None:
+                self.state, self.error = 'loading', None
+                started = time.perf_counter()
+                try:
+                    instance = self.factory()
+                except Exception as e:
+                    self.state, self.error = 'failed', f"{type(e).__name__}: {e}"
+                    raise
+                finally:
+                    self.load_seconds = time.perf_counter() - started
+                self._instance = instance
+                self.state = 'ready'
+        return self._instance
+
+    def warm(self) -> None:
+        # Background load; failures stay visible on /health instead of raising
+        try:
+            self.get()
+        except Exception:
+            traceback.print_exc()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'state': self.state,
+            'load_seconds': round(self.load_seconds, 3) if self.load_seconds is not None else None,
+            'error': self.error
+        }
+
+
+class Subsystems:
+    def __init__(self, factories: Optional[Dict[str, Callable[[], Any]]] = None):
+        factories = factories or SUBSYSTEMS
+        self._subsystems = {name: LazySubsystem(name, factory) for name, factory in factories.items()}
+
+    def __getitem__(self, name: str) -> LazySubsystem:
+        return self._subsystems[name]
+
+    def get(self, name: str) -> Any:
+        return self._subsystems[name].get()
+
+    def warm(self, names: List[str] = WARMUP) -> None:
+        """Loads the named subsystems one after another; meant for a background thread."""
+        for name in names:
+            if name in self._subsystems:
+                self._subsystems[name].warm()
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        return {name: subsystem.status() for name, subsystem in self._subsystems.items()}
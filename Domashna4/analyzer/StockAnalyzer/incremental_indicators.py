@@ -0,0 +1,280 @@
+import hashlib
+import json
+import math
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from DataStorage import DataStorage
+
+# Bump when the state layout or any indicator formula changes; stored states
+# from another version are rebuilt
+ENGINE_VERSION = 1
+
+# Longest rolling buffer (SMA/WMA/CCI); also how many already consumed rows are
+# re-read and fingerprinted on every advance to detect corrected history
+OVERLAP_ROWS = 20
+
+NAN = float('nan')
+
+
+def _div(numerator: float, denominator: float) -> float:
+    # IEEE division like NumPy's: x/0 is +-inf and 0/0 is NaN instead of raising
+    if denominator == 0:
+        if numerator == 0 or math.isnan(numerator):
+            return NAN
+        return math.copysign(math.inf, numerator) * math.copysign(1.0, denominator)
+    return numerator / denominator
+
+
+def _ema_step(state: Dict[str, Any], value: float, alpha: float, min_periods: int) -> float:
+    """
+    One step of pandas' ewm(alpha, min_periods, adjust=False).mean(). Leading
+    NaN inputs (a not yet warmed-up source) are skipped just like pandas does.
+    """
+    if math.isnan(value):
+        return state['value'] if state['count'] >= min_periods else NAN
+
+    if state['count'] == 0:
+        state['value'] = value
+    elif state['value'] != value:
+        old_weight = 1.0 - alpha
+        state['value'] = (old_weight * state['value'] + alpha * value) / (old_weight + alpha)
+    state['count'] += 1
+    return state['value'] if state['count'] >= min_periods else NAN
+
+
+def _push(buffer: List[float], value: float, size: int) -> None:
+    buffer.append(value)
+    if len(buffer) > size:
+        del buffer[0]
+
+
+def _mean(values: List[float]) -> float:
+    return math.fsum(values) / len(values)
+
+
+def _rolling_mean(values: List[float]) -> float:
+    # pandas returns a constant window's value exactly, which CCI relies on to
+    # give 0 instead of amplified rounding noise on days without trading
+    if all(value == values[0] for value in values):
+        return values[0]
+    return _mean(values)
+
+
+def new_state() -> Dict[str, Any]:
+    ema = lambda: {'value': NAN, 'count': 0}
+    return {
+        'version': ENGINE_VERSION,
+        'last_date': None,
+        'rows': 0,
+        'ema': {'12': ema(), '26': ema(), '20': ema()},
+        'macd_signal': ema(),
+        'ppo_signal': ema(),
+        'trix_ema2': ema(),
+        'trix_ema3': ema(),
+        'trix_previous': NAN,
+        'rsi_up': ema(),
+        'rsi_down': ema(),
+        'previous_close': NAN,
+        'closes': [],
+        'highs': [],
+        'lows': [],
+        'typical_prices': [],
+        'stoch_k': [],
+        'values': {}
+    }
+
+
+def step(state: Dict[str, Any], row_date: date, close: float, high: float, low: float) -> Dict[str, float]:
+    """
+    Advances the state by one trading day and returns that day's indicator
+    values, with the same formulas and warm-up rules as IndicatorGraph.
+    """
+    ema12 = _ema_step(state['ema']['12'], close, 2 / 13, 12)
+    ema26 = _ema_step(state['ema']['26'], close, 2 / 27, 26)
+    ema20 = _ema_step(state['ema']['20'], close, 2 / 21, 20)
+
+    macd = ema12 - ema26
+    ppo = _div(macd, ema26) * 100
+    macd_signal = _ema_step(state['macd_signal'], macd, 2 / 10, 9)
+    ppo_signal = _ema_step(state['ppo_signal'], ppo, 2 / 10, 9)
+
+    ema3 = _ema_step(state['trix_ema3'], _ema_step(state['trix_ema2'], ema20, 2 / 21, 20), 2 / 21, 20)
+    trix = _div(ema3 - state['trix_previous'], state['trix_previous']) * 100
+    state['trix_previous'] = ema3
+
+    diff = close - state['previous_close']
+    state['previous_close'] = close
+    up = _ema_step(state['rsi_up'], diff if diff > 0 else 0.0, 1 / 14, 14)
+    down = _ema_step(state['rsi_down'], -diff if diff < 0 else 0.0, 1 / 14, 14)
+    rsi = 100.0 if down == 0 else 100 - _div(100, 1 + _div(up, down))
+
+    _push(state['closes'], close, OVERLAP_ROWS)
+    _push(state['highs'], high, 14)
+    _push(state['lows'], low, 14)
+    _push(state['typical_prices'], (high + low + close) / 3.0, 20)
+    closes = state['closes']
+
+    stoch_k = williams_r = NAN
+    if len(state['highs']) == 14:
+        highest, lowest = max(state['highs']), min(state['lows'])
+        stoch_k = _div(100 * (close - lowest), highest - lowest)
+        williams_r = _div(-100 * (highest - close), highest - lowest)
+    _push(state['stoch_k'], stoch_k, 3)
+    stoch_d = _rolling_mean(state['stoch_k']) if len(state['stoch_k']) == 3 else NAN
+
+    roc = NAN
+    if len(closes) >= 13:
+        roc = _div(close - closes[-13], closes[-13]) * 100
+
+    sma = wma = cci = NAN
+    if len(closes) == 20:
+        sma = _rolling_mean(closes)
+        wma = sum(i * 2 / (20 * 21) * value for i, value in enumerate(closes, start=1))
+        typical_prices = state['typical_prices']
+        # Same summation order as IndicatorGraph.cci so flat windows round alike
+        window = np.asarray(typical_prices)
+        mad = float(np.abs(window - window.mean()).mean())
+        cci = _div(typical_prices[-1] - _rolling_mean(typical_prices), 0.015 * mad)
+
+    state['rows'] += 1
+    state['last_date'] = row_date.isoformat()
+    state['values'] = {
+        'Close': close,
+        'RSI': rsi,
+        'Stoch_%K': stoch_k,
+        'Stoch_%D': stoch_d,
+        'Williams_R': williams_r,
+        'PPO': ppo,
+        'PPO_Signal': ppo_signal,
+        'ROC': roc,
+        'CCI': cci,
+        'SMA_20': sma,
+        'EMA_20': ema20,
+        'WMA_20': wma,
+        'MACD': macd,
+        'MACD_Signal': macd_signal,
+        'TRIX': trix
+    }
+    return state['values']
+
+
+def fingerprint(rows: List[Tuple]) -> str:
+    payload = json.dumps([[str(row[0]), row[3], row[4], row[5]] for row in rows])
+    return hashlib.sha1(f"{ENGINE_VERSION}:{payload}".encode()).hexdigest()
+
+
+class IncrementalIndicatorEngine:
+    """
+    Keeps each issuer's running indicator state (EMAs, Wilder averages, rolling
+    buffers) in the indicator_state table and advances it by the rows added
+    since it was saved. The state is rebuilt by replaying the last
+    `replay_rows` rows when there is none yet, when the engine version changed
+    or when the last OVERLAP_ROWS consumed rows no longer match their
+    fingerprint (corrected history).
+    """
+    def __init__(self, storage: DataStorage, replay_rows: int):
+        self.storage = storage
+        self.replay_rows = replay_rows
+
+    def latest(self, issuer: str) -> Optional[Tuple[date, Dict[str, float]]]:
+        """
+        Date and indicator values of the issuer's last trading day, or None when
+        the history cannot be handled incrementally (missing prices).
+        """
+        state, saved_fingerprint = self._load(issuer)
+        if state is not None:
+            advanced = self._advance(issuer, state, saved_fingerprint)
+            if advanced is not None:
+                return advanced
+        return self._rebuild(issuer)
+
+    def reset(self, issuer: str) -> None:
+        self.storage.delete_indicator_state(issuer)
+
+    def _advance(self, issuer: str, state: Dict[str, Any],
+                 saved_fingerprint: str) -> Optional[Tuple[date, Dict[str, float]]]:
+        overlap_since = state.get('overlap_since')
+        rows = self.storage.get_by_issuer(issuer, since=_parse_date(overlap_since))
+        consumed = [row for row in rows if row[0] <= _parse_date(state['last_date'])]
+        if fingerprint(consumed) != saved_fingerprint:
+            return None
+
+        new_rows = rows[len(consumed):]
+        if not new_rows:
+            return _parse_date(state['last_date']), _from_json(state['values'])
+        if not self._replayable(new_rows):
+            return None
+
+        self._replay(state, new_rows)
+        self._save(issuer, state, (consumed + new_rows)[-OVERLAP_ROWS:])
+        return new_rows[-1][0], state['values']
+
+    def _rebuild(self, issuer: str) -> Optional[Tuple[date, Dict[str, float]]]:
+        rows = self.storage.get_by_issuer(issuer, limit_last=self.replay_rows)
+        if not rows or not self._replayable(rows):
+            return None
+
+        state = new_state()
+        self._replay(state, rows)
+        self._save(issuer, state, rows[-OVERLAP_ROWS:])
+        return rows[-1][0], state['values']
+
+    @staticmethod
+    def _replay(state: Dict[str, Any], rows: List[Tuple]) -> None:
+        # Rows are (date, issuer, avg_price, last_trade_price, max_price, min_price, ...)
+        for row in rows:
+            step(state, row[0], float(row[3]), float(row[4]), float(row[5]))
+
+    @staticmethod
+    def _replayable(rows: List[Tuple]) -> bool:
+        # Days without a close, high or low follow pandas' NaN rules, which the
+        # vectorized path handles; the engine steps aside for those histories
+        return all(value is not None and not math.isnan(value) for row in rows for value in row[3:6])
+
+    def _load(self, issuer: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        saved = self.storage.get_indicator_state(issuer)
+        if saved is None:
+            return None, None
+        state, saved_fingerprint = saved
+        if state.get('version') != ENGINE_VERSION:
+            return None, None
+        return _from_json(state), saved_fingerprint
+
+    def _save(self, issuer: str, state: Dict[str, Any], overlap: List[Tuple]) -> None:
+        state['overlap_since'] = overlap[0][0].isoformat()
+        self.storage.save_indicator_state(
+            issuer, _parse_date(state['last_date']), fingerprint(overlap), _to_json(state)
+        )
+
+
+def _parse_date(value: Optional[str]) -> Optional[date]:
+    return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+
+
+def _to_json(value: Any) -> Any:
+    # JSONB has neither NaN nor +-inf (which _div returns for x/0), so NaN is
+    # stored as null and infinities as strings that _from_json turns back
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, float) and math.isinf(value):
+        return 'inf' if value > 0 else '-inf'
+    if isinstance(value, dict):
+        return {key: _to_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_to_json(item) for item in value]
+    return value
+
+
+def _from_json(value: Any, key: str = '') -> Any:
+    if isinstance(value, dict):
+        return {k: _from_json(item, k) for k, item in value.items()}
+    if isinstance(value, list):
+        return [_from_json(item, key) for item in value]
+    if value is None and key not in ('last_date', 'overlap_since'):
+        return NAN
+    if value in ('inf', '-inf'):
+        return float(value)
+    return value
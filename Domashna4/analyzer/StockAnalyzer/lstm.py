@@ -2,16 +2,18 @@ from DataStorage import DataStorage
 import numpy as np
 import pandas as pd
 from sklearn.preprocessing import StandardScaler
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import LSTM, Dense, Input, Dropout, BatchNormalization
-from tensorflow.keras.callbacks import EarlyStopping, ReduceLROnPlateau
-from tensorflow.keras.regularizers import l1_l2
 import matplotlib.pyplot as plt
 from LSTMModelStorage import ModelStorage
+from lstm_runtime import NumpyLSTMModel
+from PriceHistoryCache import PriceHistoryCache
 import category_encoders as ce
 
 
 class LSTMAnalyzer:
+    # Enough rows for the 20-day features, the MACD warm-up and the input window
+    HISTORY_ROWS = 300
+    MODEL_NAME = "stock_model_good"
+
     def __init__(self):
         self.n_lags = 20
         self.price_scaler = StandardScaler()
@@ -19,9 +21,13 @@ class LSTMAnalyzer:
         self.binary_encoder = ce.BinaryEncoder()
         self.model = None
         self.feature_dims = None
+        # Compiled forward pass of self.model, rebuilt when the model changes
+        self._forward = None
+        self._forward_model = None
 
         self.model_storage = ModelStorage()
         self.data_storage = DataStorage()
+        self.price_cache = PriceHistoryCache(self.data_storage)
 
         self.price_features = ['Close', 'High', 'Low', 'Avg Price', 'MA5', 'MA20']
         self.volume_features = ['Volume', 'Turnover in BEST in denars', 'Total turnover in denars']
@@ -50,33 +56,46 @@ class LSTMAnalyzer:
     def prepare_data(self, data):
         df = pd.DataFrame(data, columns=self.columns) if not isinstance(data, pd.DataFrame) else data.copy()
 
-        for col in self.numeric_cols:
-            df[col] = df[col].str.replace('.', '', regex=False).str.replace(',', '.', regex=False)
-            df[col] = pd.to_numeric(df[col], errors='coerce')
+        df[self.numeric_cols] = df[self.numeric_cols].astype(float)
 
         df['Date'] = pd.to_datetime(df['Date'])
         df = df.sort_values(['Date', 'Issuer'], ascending=True)
         df['unique_index'] = df['Date'].astype(str) + '_' + df['Issuer']
         df.set_index('unique_index', inplace=True)
 
-        for issuer in df['Issuer'].unique():
-            mask = df['Issuer'] == issuer
-
-            df.loc[mask, 'MA5'] = df.loc[mask, 'Close'].rolling(window=5).mean()
-            df.loc[mask, 'MA20'] = df.loc[mask, 'Close'].rolling(window=20).mean()
-
-            df.loc[mask, 'Price_to_MA5'] = df.loc[mask, 'Close'] / df.loc[mask, 'MA5'] - 1
-            df.loc[mask, 'Price_to_MA20'] = df.loc[mask, 'Close'] / df.loc[mask, 'MA20'] - 1
-
-            delta = df.loc[mask, 'Close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=10).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=10).mean()
+        # One grouped pass instead of a masked assignment per issuer. It runs on
+        # an issuer-major copy keyed by integer codes, where every issuer is a
+        # contiguous block, so the grouped results line up with it row for row
+        # and are scattered back to the frame's date order by position
+        order = np.argsort(df['Issuer'].to_numpy(), kind='stable')
+        codes, _ = pd.factorize(df['Issuer'].to_numpy()[order])
+        close = pd.Series(df['Close'].to_numpy()[order])
+        by_issuer = close.groupby(codes, sort=False)
+
+        def in_frame_order(values):
+            result = np.empty(len(order))
+            result[order] = np.asarray(values, dtype=float)
+            return result
+
+        ma5 = by_issuer.rolling(window=5).mean().to_numpy()
+        ma20 = by_issuer.rolling(window=20).mean().to_numpy()
+        df['MA5'] = in_frame_order(ma5)
+        df['MA20'] = in_frame_order(ma20)
+
+        df['Price_to_MA5'] = in_frame_order(close / ma5 - 1)
+        df['Price_to_MA20'] = in_frame_order(close / ma20 - 1)
+
+        delta = by_issuer.diff()
+        gain = (delta.where(delta > 0, 0)).groupby(codes, sort=False).rolling(window=10).mean().to_numpy()
+        loss = (-delta.where(delta < 0, 0)).groupby(codes, sort=False).rolling(window=10).mean().to_numpy()
+        # x/0 gives inf (RSI 100) and 0/0 NaN, like the pandas division it replaces
+        with np.errstate(divide='ignore', invalid='ignore'):
             rs = gain / loss
-            df.loc[mask, 'RSI'] = 100 - (100 / (1 + rs))
+        df['RSI'] = in_frame_order(100 - (100 / (1 + rs)))
 
-            exp1 = df.loc[mask, 'Close'].ewm(span=12, adjust=False).mean()
-            exp2 = df.loc[mask, 'Close'].ewm(span=26, adjust=False).mean()
-            df.loc[mask, 'MACD'] = exp1 - exp2
+        exp1 = by_issuer.ewm(span=12, adjust=False).mean().to_numpy()
+        exp2 = by_issuer.ewm(span=26, adjust=False).mean().to_numpy()
+        df['MACD'] = in_frame_order(exp1 - exp2)
 
         return df.dropna()
 
@@ -109,31 +128,61 @@ class LSTMAnalyzer:
 
         return feature_matrix, price_scaled[:, 0]
 
+    @staticmethod
+    def sliding_windows(values, n_lags):
+        """
+        Every run of n_lags consecutive rows of a 2-D array, as a read-only
+        (len - n_lags + 1, n_lags, features) view; nothing is copied.
+        """
+        if len(values) < n_lags:
+            return np.empty((0, n_lags) + values.shape[1:], dtype=values.dtype)
+        return np.lib.stride_tricks.sliding_window_view(values, n_lags, axis=0).transpose(0, 2, 1)
+
     def prepare_sequences(self, data, training=True):
         feature_matrix, targets = self.create_feature_matrix(data, training)
 
         X, y = [], []
+        issuers = data['Issuer'].to_numpy()
         for issuer in data['Issuer'].unique():
-            issuer_mask = data['Issuer'] == issuer
+            issuer_mask = issuers == issuer
             issuer_data = feature_matrix[issuer_mask]
             issuer_targets = targets[issuer_mask]
+            windows = self.sliding_windows(issuer_data, self.n_lags)
 
+            # The window ending on the last row has no next value to target
             if training:
                 returns = np.diff(issuer_targets) / issuer_targets[:-1]
-                for i in range(len(issuer_data) - self.n_lags - 1):
-                    X.append(issuer_data[i:i + self.n_lags])
-                    y.append(returns[i + self.n_lags])
+                count = max(len(issuer_data) - self.n_lags - 1, 0)
+                y.append(returns[self.n_lags:self.n_lags + count])
             else:
-                for i in range(len(issuer_data) - self.n_lags):
-                    X.append(issuer_data[i:i + self.n_lags])
-                    if i + self.n_lags < len(issuer_targets):
-                        y.append(issuer_targets[i + self.n_lags])
-                    else:
-                        y.append(np.nan)
-
-        return np.array(X), np.array(y)
+                count = max(len(issuer_data) - self.n_lags, 0)
+                y.append(issuer_targets[self.n_lags:self.n_lags + count])
+            X.append(windows[:count])
+
+        if len(X) == 1:
+            return X[0], y[0]
+        return np.concatenate(X), np.concatenate(y)
+
+    def last_sequence(self, data):
+        """
+        The window predict_next_days starts from, prepare_sequences(data,
+        training=False)[0][-1], built from only the rows it covers.
+        """
+        issuer = data['Issuer'].unique()[-1]
+        issuer_data = data[data['Issuer'] == issuer]
+        if len(issuer_data) <= self.n_lags:
+            raise ValueError(f"Need more than {self.n_lags} rows of {issuer} for a sequence")
+
+        window = issuer_data.iloc[-self.n_lags - 1:-1].copy()
+        feature_matrix, _ = self.create_feature_matrix(window, training=False)
+        return feature_matrix
 
     def build_model(self, input_shape):
+        # TensorFlow is only needed for training; serving runs the exported NumPy model
+        from tensorflow.keras.models import Sequential
+        from tensorflow.keras.layers import LSTM, Dense, Input, Dropout, BatchNormalization
+        from tensorflow.keras.regularizers import l1_l2
+
         model = Sequential([
             Input(shape=input_shape),
             LSTM(128, activation='tanh', return_sequences=True,
@@ -155,6 +204,8 @@ class LSTMAnalyzer:
         return model
 
     def get_callbacks(self):
+        from tensorflow.keras.callbacks import EarlyStopping, ReduceLROnPlateau
+
         return [
             EarlyStopping(monitor='val_loss',
                           patience=5,
@@ -205,30 +256,64 @@ class LSTMAnalyzer:
 
         return history
 
+    def forward(self, sequences):
+        """
+        Same output as self.model.predict(sequences, verbose=0), through a
+        tf.function traced once per model for a fixed input signature instead of
+        predict's per-call data adapter and batching. An exported NumpyLSTMModel
+        is called directly.
+        """
+        if isinstance(self.model, NumpyLSTMModel):
+            return self.model.predict(sequences)
+        if self._forward_model is not self.model:
+            import tensorflow as tf
+
+            model = self.model
+            signature = tf.TensorSpec(shape=(None,) + tuple(model.input_shape[1:]), dtype=tf.float32)
+            self._forward = tf.function(
+                lambda x: model(x, training=False), input_signature=[signature], autograph=False
+            )
+            self._forward_model = model
+        return self._forward(np.asarray(sequences, dtype=np.float32)).numpy()
+
     def predict_next_days(self, data, days=5):
-        df = self.prepare_data(data)
-        X, _ = self.prepare_sequences(df, training=False)
+        return self.predict_prepared([self.prepare_data(data)], days)[0]
+
+    def predict_prepared(self, frames, days=5):
+        """
+        Forecasts for several prepared issuer frames at once. The autoregressive
+        loop advances every issuer's sequence together, with one model call per
+        forecast day for the whole batch. Returns (predictions, signal) per frame.
+        """
+        sequences, last_prices, daily_volatility, short_ma, trend_strength, momentum = [], [], [], [], [], []
+        for df in frames:
+            sequences.append(self.last_sequence(df))
+            last_prices.append(df['Close'].iloc[-1])
+
+            recent_prices = df['Close'].tail(20)
+            recent_returns = recent_prices.pct_change().dropna()
+
+            volatility = recent_returns.std()
+            daily_volatility.append(volatility / np.sqrt(252))
+
+            short = recent_prices.tail(5).mean()
+            long_ma = recent_prices.mean()
+            short_ma.append(short)
+            trend_strength.append((short / long_ma - 1) * 100)
+
+            momentum.append(recent_returns.mean())
+
+        sequences = np.stack(sequences)
+        last_known_price = np.array(last_prices)
+        daily_volatility = np.array(daily_volatility)
+        short_ma = np.array(short_ma)
+        trend_strength = np.array(trend_strength)
 
-        last_known_price = df['Close'].iloc[-1]
-        last_sequence = X[-1]
         predictions = []
         running_price = last_known_price
-
-        recent_prices = df['Close'].tail(20)
-        recent_returns = recent_prices.pct_change().dropna()
-
-        volatility = recent_returns.std()
-        daily_volatility = volatility / np.sqrt(252)
-
-        short_ma = recent_prices.tail(5).mean()
-        long_ma = recent_prices.mean()
-        trend_strength = (short_ma / long_ma - 1) * 100
-
-        momentum = recent_returns.mean()
-
-        running_momentum = momentum
+        running_momentum = np.array(momentum)
         for day in range(days):
-            predicted_return = self.model.predict(last_sequence[np.newaxis, :, :], verbose=0)[0][0]
+            predicted_return = self.forward(sequences)[:, 0]
 
             random_factor = np.random.normal(0, daily_volatility)
 
@@ -245,44 +330,57 @@ class LSTMAnalyzer:
                     random_weight * random_factor
             )
 
-            max_daily_move = min(0.03, 2 * daily_volatility)
+            # min(0.03, 2 * daily_volatility) per issuer
+            max_daily_move = np.where(2 * daily_volatility < 0.03, 2 * daily_volatility, 0.03)
             blended_return = np.clip(blended_return, -max_daily_move, max_daily_move)
 
             next_price = running_price * (1 + blended_return)
 
-            if abs(next_price / short_ma - 1) > 0.05:
-                reversion_strength = 0.3
-                next_price = next_price * (1 - reversion_strength) + short_ma * reversion_strength
+            reversion_strength = 0.3
+            next_price = np.where(
+                np.abs(next_price / short_ma - 1) > 0.05,
+                next_price * (1 - reversion_strength) + short_ma * reversion_strength,
+                next_price
+            )
 
             predictions.append(next_price)
 
-            price_scaled = self.price_scaler.transform([[next_price] + [0] * (self.price_dims - 1)])[0, 0]
+            scaler_input = np.zeros((len(frames), self.price_dims))
+            scaler_input[:, 0] = next_price
+            price_scaled = self.price_scaler.transform(scaler_input)[:, 0]
 
+            price_block = np.zeros((len(frames), self.price_dims))
+            price_block[:, 0] = price_scaled
             new_features = np.concatenate([
-                [price_scaled] + [0] * (self.price_dims - 1),
-                last_sequence[-1, self.price_dims:self.price_dims + self.volume_dims],
-                last_sequence[-1,
+                price_block,
+                sequences[:, -1, self.price_dims:self.price_dims + self.volume_dims],
+                sequences[:, -1,
                 self.price_dims + self.volume_dims:self.price_dims + self.volume_dims + self.tech_dims],
-                last_sequence[-1, -self.issuer_dims:]
-            ])
+                sequences[:, -1, -self.issuer_dims:]
+            ], axis=1)
 
-            last_sequence = np.vstack([last_sequence[1:], new_features])
+            sequences = np.concatenate([sequences[:, 1:], new_features[:, np.newaxis, :]], axis=1)
             running_price = next_price
 
             running_momentum = 0.7 * running_momentum + 0.3 * blended_return
 
-        pct_change = (predictions[-1] - last_known_price) / last_known_price * 100
+        predictions = np.array(predictions)
+        results = []
+        for i, last_price in enumerate(last_known_price):
+            pct_change = (predictions[-1, i] - last_price) / last_price * 100
 
-        if abs(pct_change) < 1.5:
-            signal = "Neutral"
-        else:
-            confidence = min(abs(pct_change) / 3, 1)
-            if pct_change > 0:
-                signal = f"Positive (Confidence: {confidence:.2f})"
+            if abs(pct_change) < 1.5:
+                signal = "Neutral"
             else:
-                signal = f"Negative (Confidence: {confidence:.2f})"
+                confidence = min(abs(pct_change) / 3, 1)
+                if pct_change > 0:
+                    signal = f"Positive (Confidence: {confidence:.2f})"
+                else:
+                    signal = f"Negative (Confidence: {confidence:.2f})"
+
+            results.append((predictions[:, i], signal))
 
-        return np.array(predictions), signal
+        return results
 
     def plot_next_days(self, data, days=5):
         df = self.prepare_data(data)
@@ -322,8 +420,10 @@ class LSTMAnalyzer:
 
     def data_for_plotting(self, data, days=5):
         df = self.prepare_data(data)
-        predictions, signal = self.predict_next_days(data, days)
+        predictions, signal = self.predict_prepared([df], days)[0]
+        return self.plotting_payload(df, predictions, signal, days)
 
+    def plotting_payload(self, df, predictions, signal, days=5):
         last_date = df['Date'].max()
         future_dates = [last_date + pd.Timedelta(days=i) for i in range(1, days + 1)]
 
@@ -350,15 +450,47 @@ class LSTMAnalyzer:
             "dailyPercent": daily_percent
         }
 
-    def perform_prediction(self, issuer, days=5):
-        model_params = self.model_storage.load_model("stock_model_good")
+    def use_saved_model(self):
+        model_params = self.model_storage.get_model(self.MODEL_NAME)
         self.load_model(model_params[0], model_params[1], model_params[2], model_params[3],
                         model_params[4]['enc_len'])
-        data = self.data_storage.get_by_issuer(issuer)
+
+    def perform_prediction(self, issuer, days=5):
+        self.use_saved_model()
+        data = self.price_cache.get_history(issuer, self.columns, limit_last=self.HISTORY_ROWS)
         if len(data) < 100:
             print(f"Insufficient data for {issuer}")
             return
 
         return self.data_for_plotting(data, days)
 
-   
\ No newline at end of file
+    def perform_predictions(self, issuers=None, days=5):
+        """
+        perform_prediction for a list of issuers, or for all of them, from one
+        read of issuer_data and one batched model call per forecast day. Issuers
+        with too little data are left out.
+        """
+        self.use_saved_model()
+        rows = self.data_storage.get_all_issuers_data(limit_last=self.HISTORY_ROWS, issuers=issuers)
+        data = pd.DataFrame(rows, columns=self.columns)
+
+        frames = {}
+        for issuer, history in data.groupby('Issuer', sort=True):
+            if len(history) < 100:
+                print(f"Insufficient data for {issuer}")
+                continue
+            df = self.prepare_data(history)
+            # prepare_data drops days with missing prices, so an illiquid issuer can
+            # be left without a full window even with enough raw rows
+            if len(df) <= self.n_lags:
+                print(f"Insufficient complete trading days for {issuer}")
+                continue
+            frames[issuer] = df
+        if not frames:
+            return {}
+
+        forecasts = self.predict_prepared(list(frames.values()), days)
+        return {
+            issuer: self.plotting_payload(df, predictions, signal, days)
+            for (issuer, df), (predictions, signal) in zip(frames.items(), forecasts)
+        }
@@ -0,0 +1,179 @@
+"""
+NumPy inference for the network LSTMAnalyzer.build_model trains (LSTM,
+BatchNormalization, Dropout and Dense layers), so forecasts can be served
+without importing TensorFlow. Training stays in Keras; export_npz turns a
+trained model into the plain .npz the runtime loads.
+
+    python lstm_runtime.py models/stock_model_good
+"""
+import hashlib
+import json
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+NPZ_NAME = 'model.npz'
+NPZ_FORMAT = 1
+
+ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0),
+    'tanh': np.tanh,
+    'sigmoid': lambda x: 1 / (1 + np.exp(-x))
+}
+
+
+def _activation(name: str):
+    if name not in ACTIVATIONS:
+        raise ValueError(f"Unsupported activation for the NumPy runtime: {name}")
+    return ACTIVATIONS[name]
+
+
+def file_digest(path: str) -> Dict[str, Any]:
+    """Size and sha1 of a file; unlike mtimes, these survive a git checkout or a copy."""
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha1.update(chunk)
+    return {'size': os.path.getsize(path), 'sha1': sha1.hexdigest()}
+
+
+def export_npz(model: Any, path: str, source_path: Optional[str] = None) -> None:
+    """
+    Writes the weights and layer settings of a trained Keras model to `path`.
+    With `source_path` (the saved model.keras) its digest is recorded too, so
+    loaders can tell whether the export still matches it.
+    """
+    layers: List[Dict[str, Any]] = []
+    arrays: Dict[str, np.ndarray] = {}
+    for index, layer in enumerate(model.layers):
+        kind = type(layer).__name__
+        config = layer.get_config()
+        weights = layer.get_weights()
+
+        if kind == 'Dropout':
+            continue
+        if kind == 'LSTM':
+            if config.get('go_backwards') or config.get('stateful') or not config.get('use_bias', True):
+                raise ValueError(f"Unsupported LSTM configuration in layer {layer.name}")
+            _activation(config['activation'])
+            _activation(config['recurrent_activation'])
+            spec = {
+                'type': kind, 'units': config['units'], 'return_sequences': config['return_sequences'],
+                'activation': config['activation'], 'recurrent_activation': config['recurrent_activation']
+            }
+            names = ['kernel', 'recurrent_kernel', 'bias']
+        elif kind == 'BatchNormalization':
+            if config['axis'] not in (-1, [-1]):
+                raise ValueError(f"Unsupported BatchNormalization axis in layer {layer.name}")
+            spec = {'type': kind, 'epsilon': config['epsilon'],
+                    'center': config['center'], 'scale': config['scale']}
+            names = (['gamma'] if config['scale'] else []) + (['beta'] if config['center'] else []) \
+                + ['moving_mean', 'moving_variance']
+        elif kind == 'Dense':
+            _activation(config['activation'])
+            spec = {'type': kind, 'activation': config['activation'], 'use_bias': config['use_bias']}
+            names = ['kernel'] + (['bias'] if config['use_bias'] else [])
+        else:
+            raise ValueError(f"Unsupported layer for the NumPy runtime: {kind}")
+
+        for name, value in zip(names, weights):
+            arrays[f"{index}_{name}"] = np.asarray(value, dtype=np.float32)
+        spec['index'] = index
+        layers.append(spec)
+
+    architecture = {
+        'format': NPZ_FORMAT,
+        'input_shape': list(model.input_shape[1:]),
+        'layers': layers,
+        'source': file_digest(source_path) if source_path else None
+    }
+    # Written next to the target and renamed so a loading server never sees half a file
+    tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez(tmp_path, architecture=np.array(json.dumps(architecture)), **arrays)
+    os.replace(tmp_path, path)
+
+
+class NumpyLSTMModel:
+    """
+    Forward pass of an exported model in float32, the dtype Keras runs it in.
+    Gate order and formulas follow Keras' LSTM (input, forget, cell, output);
+    BatchNormalization uses its moving statistics and Dropout is a no-op, as
+    at inference time.
+    """
+    def __init__(self, architecture: Dict[str, Any], arrays: Dict[str, np.ndarray]):
+        if architecture.get('format') != NPZ_FORMAT:
+            raise ValueError(f"Unsupported model export format: {architecture.get('format')}")
+        self.input_shape = (None,) + tuple(architecture['input_shape'])
+        self.layers = architecture['layers']
+        self.arrays = arrays
+        # file_digest of the model.keras this was exported from, if recorded
+        self.source = architecture.get('source')
+
+    @classmethod
+    def load(cls, path: str) -> 'NumpyLSTMModel':
+        with np.load(path, allow_pickle=False) as npz:
+            architecture = json.loads(str(npz['architecture']))
+            arrays = {name: npz[name] for name in npz.files if name != 'architecture'}
+        return cls(architecture, arrays)
+
+    def predict(self, x: np.ndarray, verbose: int = 0) -> np.ndarray:
+        """Same shape and meaning as the Keras model's predict output."""
+        x = np.asarray(x, dtype=np.float32)
+        for layer in self.layers:
+            weights = lambda name: self.arrays[f"{layer['index']}_{name}"]
+            if layer['type'] == 'LSTM':
+                x = self._lstm(x, layer, weights('kernel'), weights('recurrent_kernel'), weights('bias'))
+            elif layer['type'] == 'BatchNormalization':
+                scale = 1 / np.sqrt(weights('moving_variance') + np.float32(layer['epsilon']))
+                if layer['scale']:
+                    scale = scale * weights('gamma')
+                x = (x - weights('moving_mean')) * scale
+                if layer['center']:
+                    x = x + weights('beta')
+            elif layer['type'] == 'Dense':
+                x = x @ weights('kernel')
+                if layer['use_bias']:
+                    x = x + weights('bias')
+                x = _activation(layer['activation'])(x)
+        return x
+
+    __call__ = predict
+
+    @staticmethod
+    def _lstm(x: np.ndarray, layer: Dict[str, Any], kernel: np.ndarray,
+              recurrent_kernel: np.ndarray, bias: np.ndarray) -> np.ndarray:
+        units = layer['units']
+        activation = _activation(layer['activation'])
+        recurrent_activation = _activation(layer['recurrent_activation'])
+
+        # Input projections of every timestep in one matmul
+        projected = x @ kernel + bias
+        h = np.zeros((x.shape[0], units), dtype=np.float32)
+        c = np.zeros((x.shape[0], units), dtype=np.float32)
+        outputs = []
+        for t in range(x.shape[1]):
+            z = projected[:, t] + h @ recurrent_kernel
+            i = recurrent_activation(z[:, :units])
+            f = recurrent_activation(z[:, units:2 * units])
+            c = f * c + i * activation(z[:, 2 * units:3 * units])
+            h = recurrent_activation(z[:, 3 * units:]) * activation(c)
+            outputs.append(h)
+        return np.stack(outputs, axis=1) if layer['return_sequences'] else h
+
+
+def main() -> int:
+    # Exporting reads model.keras, so this is the one place that needs TensorFlow
+    from tensorflow.keras.models import load_model
+
+    for model_dir in sys.argv[1:] or [os.path.join('models', 'stock_model_good')]:
+        keras_path = os.path.join(model_dir, 'model.keras')
+        export_npz(load_model(keras_path), os.path.join(model_dir, NPZ_NAME), source_path=keras_path)
+        print(f"Exported {os.path.join(model_dir, NPZ_NAME)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,23 +1,41 @@
 from http.client import HTTPException
 
+import os
+import threading
+from datetime import date
+
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from nlp import NLPProcessor
 from technical_analysis import TechnicalAnalyzer
-from lstm import LSTMAnalyzer
+from DataStorage import DataStorage
+from ResponseCache import ResponseCache
+from PriceHistoryCache import PriceHistoryCache
+from Executors import Executors, analyze_all_technical, refresh_technical_signals
+from Subsystems import Subsystems
+
+# News is scraped live, so its responses can only expire by age
+NEWS_TTL_SECONDS = float(os.getenv('RESPONSE_CACHE_NEWS_TTL_SECONDS', '900'))
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    app.state.nlp_processor = NLPProcessor()
+    # NLP and LSTM load on first use or from the warm-up thread, so the service
+    # answers /health and the technical endpoints while they are still loading
+    app.state.subsystems = Subsystems()
     app.state.technical_analyzer = TechnicalAnalyzer()
-    app.state.lstm_analyzer = LSTMAnalyzer()
+    app.state.storage = DataStorage()
+    app.state.response_cache = ResponseCache()
+    app.state.executors = Executors()
+    threading.Thread(target=app.state.subsystems.warm, name='analyzer-warmup', daemon=True).start()
     yield
-    del app.state.nlp_processor
+    app.state.executors.shutdown()
+    del app.state.subsystems
     del app.state.technical_analyzer
-    del app.state.lstm_analyzer
+    del app.state.storage
+    del app.state.response_cache
+    del app.state.executors
 
 
 app = FastAPI(lifespan=lifespan)
@@ -31,21 +49,97 @@ app.add_middleware(
 )
 
 
+def data_version(issuer=None):
+    # issuer_dates.last_date moves whenever the scraper has been over an issuer
+    storage = app.state.storage
+    if issuer is not None:
+        return storage.get_issuer_date(issuer)
+    return tuple(sorted(storage.load_data().items()))
+
+
+def news_signals(issuer):
+    nlp_processor = app.state.subsystems.get('nlp')
+    return app.state.response_cache.get_or_compute(
+        'nlp', issuer, (), date.today(),
+        lambda: nlp_processor.analyze_texts(issuer), ttl=NEWS_TTL_SECONDS
+    )
+
+
+def all_technical_signals():
+    executors = app.state.executors
+    return app.state.response_cache.get_or_compute(
+        'technical', None, (), data_version(),
+        lambda: executors.run_cpu('technical_all', analyze_all_technical)
+    )
+
+
+def refresh_all_technical_signals():
+    # Called by the scraper after a run; histories cached while it was writing
+    # could be missing rows, so they are re-read before the signals are stored
+    PriceHistoryCache().invalidate()
+    refreshed = app.state.executors.run_cpu('technical_refresh', refresh_technical_signals)
+    app.state.response_cache.invalidate(endpoint='technical')
+    app.state.response_cache.invalidate(endpoint='lstm')
+    return refreshed
+
+
+def technical_signals(issuer):
+    technical_analyzer = app.state.technical_analyzer
+    return app.state.response_cache.get_or_compute(
+        'technical', issuer, (), data_version(issuer),
+        lambda: technical_analyzer.get_signals(issuer)
+    )
+
+
+def all_lstm_predictions(issuers):
+    lstm_analyzer = app.state.subsystems.get('lstm')
+    return app.state.response_cache.get_or_compute(
+        'lstm', None, tuple(issuers or ()), data_version(),
+        lambda: lstm_analyzer.perform_predictions(issuers)
+    )
+
+
+def lstm_predictions(issuer):
+    lstm_analyzer = app.state.subsystems.get('lstm')
+    return app.state.response_cache.get_or_compute(
+        'lstm', issuer, (), data_version(issuer),
+        lambda: lstm_analyzer.perform_prediction(issuer)
+    )
+
+
 @app.get("/api/nlp/{issuer}")
 async def analyze_news(issuer: str):
     try:
-        nlp_processor = app.state.nlp_processor
-        signals = nlp_processor.analyze_texts(issuer)
+        signals = await app.state.executors.run('nlp', news_signals, issuer)
         return signals
     except Exception as e:
         return {"error": str(e)}
 
 
+@app.get("/api/technical")
+async def analyze_technical_all():
+    try:
+        results = await app.state.executors.run('technical_all', all_technical_signals)
+        return results
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        return {"error": str(e)}
+
+
+@app.post("/api/technical/refresh")
+async def refresh_technical():
+    try:
+        refreshed = await app.state.executors.run('technical_refresh', refresh_all_technical_signals)
+        return {"refreshed": refreshed}
+    except Exception as e:
+        return {"error": str(e)}
+
+
 @app.get("/api/technical/{issuer}")
 async def analyze_technical(issuer: str):
     try:
-        technical_analyzer = app.state.technical_analyzer
-        results = technical_analyzer.analyze_stock(issuer)
+        results = await app.state.executors.run('technical', technical_signals, issuer)
         return results
     except HTTPException as he:
         raise he
@@ -53,11 +147,23 @@ async def analyze_technical(issuer: str):
         return {"error": str(e)}
 
 
+@app.get("/api/lstm")
+async def analyze_lstm_all(issuers: str = None):
+    # ?issuers=ALK,KMB limits the forecast to those issuers, otherwise all of them
+    try:
+        selected = sorted({name for name in issuers.split(",") if name}) if issuers else None
+        predictions = await app.state.executors.run('lstm', all_lstm_predictions, selected)
+        return predictions
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        return {"error": str(e)}
+
+
 @app.get("/api/lstm/{issuer}")
 async def analyze_lstm(issuer: str):
     try:
-        lstm_analyzer = app.state.lstm_analyzer
-        predictions = lstm_analyzer.perform_prediction(issuer)
+        predictions = await app.state.executors.run('lstm', lstm_predictions, issuer)
         return predictions
     except HTTPException as he:
         raise he
@@ -65,9 +171,30 @@ async def analyze_lstm(issuer: str):
         return {"error": str(e)}
 
 
+@app.get("/api/cache")
+async def cache_stats():
+    return app.state.response_cache.stats()
+
+
+@app.get("/api/executors")
+async def executor_stats():
+    return app.state.executors.stats()
+
+
+@app.delete("/api/cache")
+async def clear_cache(issuer: str = None):
+    return {"invalidated": app.state.response_cache.invalidate(issuer)}
+
+
 @app.get("/health")
 async def health():
-    return {"status": "ok"}
+    # Always 200 once the app is up; "ready" says whether NLP and LSTM are loaded yet
+    subsystems = app.state.subsystems.status()
+    return {
+        "status": "ok",
+        "ready": all(subsystem["state"] == "ready" for subsystem in subsystems.values()),
+        "subsystems": {"technical": {"state": "ready", "load_seconds": None, "error": None}, **subsystems}
+    }
 
 if __name__ == '__main__':
     uvicorn.run(app, host="127.0.0.1", port=8005)
@@ -1,9 +1,24 @@
+import os
 import requests
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 import re
 import json
 
+BASE_URL = os.getenv('MSE_BASE_URL', "https://www.mse.mk")
+SEINET_DOCUMENT_URL = os.getenv('SEINET_DOCUMENT_URL', "https://api.seinet.com.mk/public/documents/single")
+
+
+def parse_mse_article(content):
+    soup = BeautifulSoup(content, "html.parser")
+    return soup.select_one("#content").text
+
+
+def parse_seinet_document(content):
+    document = json.loads(content)["data"]["content"]
+    return document.replace("<br>", "\n").replace("<br />", "\n").replace("<br/>", "\n").replace(
+        "<p>", "").replace("</p>", "")
+
 
 def get_text(links, source):
     texts = []
@@ -12,17 +27,13 @@ def get_text(links, source):
             try:
                 r = requests.get(link)
                 r.raise_for_status()
-                soup = BeautifulSoup(r.text, "html.parser")
-                text = soup.select_one("#content").text
-                texts.append(text)
+                texts.append(parse_mse_article(r.text))
             except Exception as e:
                 print(f"Error fetching MSE link {link}: {e}")
     elif source == 'seinet':
         for link in links:
             try:
-                content = (json.loads(requests.get(link).text))["data"]["content"]
-                formatted = content.replace("<br>", "\n").replace("<br />", "\n").replace("<br/>", "\n").replace(
-                    "<p>", "").replace("</p>", "")
+                formatted = parse_seinet_document(requests.get(link).text)
                 if formatted:
                     texts.append(formatted)
             except Exception as e:
@@ -30,17 +41,18 @@ def get_text(links, source):
     return texts
 
 
-def scrape(date, name):
-    base_url = "https://www.mse.mk"
-    r = requests.get(f"{base_url}/en/symbol/{name}")
-    soup = BeautifulSoup(r.text, "html.parser")
+def parse_news_links(content, today):
+    """
+    Returns the MSE and SEINET news links from an issuer's symbol page
+    published in the 20 days before today.
+    """
+    soup = BeautifulSoup(content, "html.parser")
     all_news_mse = soup.select_one("#stockEchangeNews").select(".tab-pane-text > a")
     all_news_seinet = soup.select_one("#seiNetIssuerLatestNews").select(".container-seinet > a")
 
     links_mse = []
     links_seinet = []
 
-    today = date.today()
     to = today - timedelta(days=20)
     pattern = r"\d{1,2}/\d{1,2}/\d{4}"
 
@@ -49,18 +61,24 @@ def scrape(date, name):
         try:
             datum = datetime.strptime(re.findall(pattern, href)[0], "%d/%m/%Y").date()
             if datum > to:
-                links_mse.append(f'{base_url}{href}')
+                links_mse.append(f'{BASE_URL}{href}')
         except Exception as e:
             print(f"Error parsing date in MSE news: {e}")
 
     for news in all_news_seinet:
         try:
             docId = news.get("href").split("/")[-1]
-            link = f"https://api.seinet.com.mk/public/documents/single/{docId}"
+            link = f"{SEINET_DOCUMENT_URL}/{docId}"
             datum = datetime.strptime(news.text.strip().split(" ")[0], "%m/%d/%Y").date()
             if datum > to:
                 links_seinet.append(link)
         except Exception as e:
             print(f"Error parsing date in SEINET news: {e}")
 
+    return links_mse, links_seinet
+
+
+def scrape(date, name):
+    r = requests.get(f"{BASE_URL}/en/symbol/{name}")
+    links_mse, links_seinet = parse_news_links(r.text, date.today())
     return get_text(links_mse, 'mse') + get_text(links_seinet, 'seinet')
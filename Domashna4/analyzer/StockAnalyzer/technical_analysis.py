@@ -1,57 +1,185 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
+import numpy as np
 import pandas as pd
 from DataStorage import DataStorage
+from PriceHistoryCache import PriceHistoryCache
+from incremental_indicators import IncrementalIndicatorEngine
+
+
+# indicator_graph.py
+class IndicatorGraph:
+    """
+    Intermediate series of one price frame, each computed on first use and then
+    shared by every indicator that needs it (EMA12/26 by MACD and PPO, the
+    rolling high/low by Stochastic and Williams %R, EMA20 by EMA_20 and TRIX).
+    The formulas follow the `ta` library so the values match it.
+    """
+    def __init__(self, data):
+        self.data = data
+        self._nodes = {}
+
+    def _node(self, key, compute):
+        if key not in self._nodes:
+            self._nodes[key] = compute()
+        return self._nodes[key]
+
+    @staticmethod
+    def _ema(series, span):
+        return series.ewm(span=span, min_periods=span, adjust=False).mean()
+
+    @staticmethod
+    def _windows(series, window):
+        # Rolling windows as a (len - window + 1, window) view, no copies
+        return np.lib.stride_tricks.sliding_window_view(series.to_numpy(dtype=float), window)
+
+    def _padded(self, values, window):
+        return pd.Series(np.concatenate([np.full(window - 1, np.nan), values]), index=self.data.index)
+
+    def ema(self, span):
+        return self._node(('ema', span), lambda: self._ema(self.data['Close'], span))
+
+    def sma(self, window):
+        return self._node(('sma', window), lambda: self.data['Close'].rolling(window, min_periods=window).mean())
+
+    def wma(self, window):
+        def compute():
+            if len(self.data) < window:
+                return pd.Series(np.nan, index=self.data.index)
+            weights = np.arange(1, window + 1) * 2 / (window * (window + 1))
+            return self._padded(self._windows(self.data['Close'], window) @ weights, window)
+        return self._node(('wma', window), compute)
+
+    def rolling_high(self, window):
+        return self._node(('high', window), lambda: self.data['High'].rolling(window, min_periods=window).max())
+
+    def rolling_low(self, window):
+        return self._node(('low', window), lambda: self.data['Low'].rolling(window, min_periods=window).min())
+
+    def typical_price(self):
+        return self._node('typical_price', lambda: (self.data['High'] + self.data['Low'] + self.data['Close']) / 3.0)
+
+    def macd(self, fast=12, slow=26):
+        return self._node(('macd', fast, slow), lambda: self.ema(fast) - self.ema(slow))
+
+    def macd_signal(self, fast=12, slow=26, sign=9):
+        return self._node(('macd_signal', fast, slow, sign), lambda: self._ema(self.macd(fast, slow), sign))
+
+    def ppo(self, fast=12, slow=26):
+        return self._node(('ppo', fast, slow), lambda: (self.macd(fast, slow) / self.ema(slow)) * 100)
+
+    def ppo_signal(self, fast=12, slow=26, sign=9):
+        return self._node(('ppo_signal', fast, slow, sign), lambda: self._ema(self.ppo(fast, slow), sign))
+
+    def rsi(self, window):
+        def compute():
+            diff = self.data['Close'].diff(1)
+            up = diff.where(diff > 0, 0.0).ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+            down = (-diff.where(diff < 0, 0.0)).ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+            return pd.Series(np.where(down == 0, 100, 100 - (100 / (1 + up / down))), index=self.data.index)
+        return self._node(('rsi', window), compute)
+
+    def stoch_k(self, window):
+        def compute():
+            low = self.rolling_low(window)
+            return 100 * (self.data['Close'] - low) / (self.rolling_high(window) - low)
+        return self._node(('stoch_k', window), compute)
+
+    def stoch_d(self, window, smooth=3):
+        return self._node(('stoch_d', window, smooth),
+                          lambda: self.stoch_k(window).rolling(smooth, min_periods=smooth).mean())
+
+    def williams_r(self, window):
+        def compute():
+            high = self.rolling_high(window)
+            return -100 * (high - self.data['Close']) / (high - self.rolling_low(window))
+        return self._node(('williams_r', window), compute)
+
+    def roc(self, window):
+        def compute():
+            shifted = self.data['Close'].shift(window)
+            return ((self.data['Close'] - shifted) / shifted) * 100
+        return self._node(('roc', window), compute)
+
+    def cci(self, window, constant=0.015):
+        def compute():
+            typical_price = self.typical_price()
+            if len(self.data) < window:
+                return pd.Series(np.nan, index=self.data.index)
+            windows = self._windows(typical_price, window)
+            mad = np.abs(windows - windows.mean(axis=1, keepdims=True)).mean(axis=1)
+            sma = typical_price.rolling(window, min_periods=window).mean()
+            return (typical_price - sma) / (constant * self._padded(mad, window))
+        return self._node(('cci', window, constant), compute)
+
+    def trix(self, window):
+        def compute():
+            ema3 = self._ema(self._ema(self.ema(window), window), window)
+            previous = ema3.shift(1, fill_value=ema3.mean())
+            return (ema3 - previous) / previous * 100
+        return self._node(('trix', window), compute)
 
 
 # indicator_factory.py
 from abc import ABC, abstractmethod
-from ta.momentum import (
-    RSIIndicator, StochasticOscillator, WilliamsRIndicator,
-    PercentagePriceOscillator, ROCIndicator
-)
-from ta.trend import (
-    MACD, CCIIndicator, SMAIndicator, EMAIndicator,
-    WMAIndicator, TRIXIndicator
-)
+
+# EMAs never forget their first value; after this many rows its weight is below
+# EMA_TOLERANCE, which is far below anything the signal thresholds can resolve
+EMA_TOLERANCE = 1e-6
+
+
+def ema_warmup(span=None, alpha=None, min_periods=None, tolerance=EMA_TOLERANCE):
+    """Rows an EMA (adjust=False) needs before its value no longer depends on where it started."""
+    alpha = alpha if alpha is not None else 2 / (span + 1)
+    min_periods = min_periods if min_periods is not None else (span or 0)
+    return min_periods + int(np.ceil(np.log(tolerance) / np.log(1 - alpha)))
+
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    # How to build the indicator from the shared graph
+    compute: Callable[[IndicatorGraph], pd.Series]
+    # Rows of history needed for its last value to match a full-history computation
+    lookback: int
+
 
 class IndicatorFactory(ABC):
-    @abstractmethod
-    def create_indicator(self, data):
-        pass
+    INDICATORS: Dict[str, IndicatorSpec] = {}
+
+    def create_indicator(self, data, graph=None):
+        graph = graph if graph is not None else IndicatorGraph(data)
+        return {name: spec.compute(graph) for name, spec in self.INDICATORS.items()}
+
+    def lookback(self):
+        return max(spec.lookback for spec in self.INDICATORS.values())
+
+    @classmethod
+    def register(cls, name, compute, lookback):
+        cls.INDICATORS = {**cls.INDICATORS, name: IndicatorSpec(compute, lookback)}
 
 class OscillatorFactory(IndicatorFactory):
-    def create_indicator(self, data):
-        return {
-            'RSI': RSIIndicator(close=data['Close'], window=14).rsi(),
-            'Stoch_%K': StochasticOscillator(
-                high=data['High'], low=data['Low'], close=data['Close'], window=14
-            ).stoch(),
-            'Stoch_%D': StochasticOscillator(
-                high=data['High'], low=data['Low'], close=data['Close'], window=14
-            ).stoch_signal(),
-            'Williams_R': WilliamsRIndicator(
-                high=data['High'], low=data['Low'], close=data['Close'], lbp=14
-            ).williams_r(),
-            'PPO': PercentagePriceOscillator(close=data['Close']).ppo(),
-            'PPO_Signal': PercentagePriceOscillator(close=data['Close']).ppo_signal(),
-            'ROC': ROCIndicator(close=data['Close'], window=12).roc(),
-            'CCI': CCIIndicator(
-                high=data['High'], low=data['Low'], close=data['Close'], window=20
-            ).cci()
-        }
+    INDICATORS = {
+        'RSI': IndicatorSpec(lambda g: g.rsi(14), 1 + ema_warmup(alpha=1 / 14, min_periods=14)),
+        'Stoch_%K': IndicatorSpec(lambda g: g.stoch_k(14), 14),
+        'Stoch_%D': IndicatorSpec(lambda g: g.stoch_d(14), 14 + 2),
+        'Williams_R': IndicatorSpec(lambda g: g.williams_r(14), 14),
+        'PPO': IndicatorSpec(lambda g: g.ppo(), ema_warmup(span=26)),
+        'PPO_Signal': IndicatorSpec(lambda g: g.ppo_signal(), ema_warmup(span=26) + ema_warmup(span=9)),
+        'ROC': IndicatorSpec(lambda g: g.roc(12), 12 + 1),
+        'CCI': IndicatorSpec(lambda g: g.cci(20), 20)
+    }
 
 class MovingAverageFactory(IndicatorFactory):
-    def create_indicator(self, data):
-        return {
-            'SMA_20': SMAIndicator(close=data['Close'], window=20).sma_indicator(),
-            'EMA_20': EMAIndicator(close=data['Close'], window=20).ema_indicator(),
-            'WMA_20': WMAIndicator(close=data['Close'], window=20).wma(),
-            'MACD': MACD(close=data['Close']).macd(),
-            'MACD_Signal': MACD(close=data['Close']).macd_signal(),
-            'TRIX': TRIXIndicator(close=data['Close'], window=20).trix()
-        }
+    INDICATORS = {
+        'SMA_20': IndicatorSpec(lambda g: g.sma(20), 20),
+        'EMA_20': IndicatorSpec(lambda g: g.ema(20), ema_warmup(span=20)),
+        'WMA_20': IndicatorSpec(lambda g: g.wma(20), 20),
+        'MACD': IndicatorSpec(lambda g: g.macd(), ema_warmup(span=26)),
+        'MACD_Signal': IndicatorSpec(lambda g: g.macd_signal(), ema_warmup(span=26) + ema_warmup(span=9)),
+        # Three chained EMAs, plus one row for the rate of change
+        'TRIX': IndicatorSpec(lambda g: g.trix(20), 3 * ema_warmup(span=20) + 1)
+    }
 
 # signal_strategies.py
 from abc import ABC, abstractmethod
@@ -77,6 +205,16 @@ class OscillatorSignalStrategy(SignalStrategy):
             return 'Sell'
         return 'Hold'
 
+    def generate_signals(self, values, indicator_name):
+        """Column version of generate_signal; NaN compares false and stays 'Hold'."""
+        thresholds = self.thresholds[indicator_name]
+        signals = np.select(
+            [values <= thresholds['buy'], values >= thresholds['sell']],
+            ['Buy', 'Sell'],
+            default='Hold'
+        )
+        return pd.Series(signals, index=values.index, dtype=object)
+
 class MovingAverageSignalStrategy(SignalStrategy):
     def generate_signal(self, data, price_col, ma_col):
         signals = pd.Series('Hold', index=data.index)
@@ -100,6 +238,18 @@ class MACDSignalStrategy(SignalStrategy):
             return 'Sell'
         return 'Hold'
 
+    def generate_signals(self, data):
+        """Column version of generate_signal; rows with NaN stay 'Hold'."""
+        macd = data['MACD']
+        macd_signal = data['MACD_Signal']
+        threshold = macd_signal.abs() * 0.15
+        signals = np.select(
+            [macd > (macd_signal + threshold), macd < (macd_signal - threshold)],
+            ['Buy', 'Sell'],
+            default='Hold'
+        )
+        return pd.Series(signals, index=data.index, dtype=object)
+
 # data_preprocessor.py
 class DataPreprocessor:
     @staticmethod
@@ -109,14 +259,7 @@ class DataPreprocessor:
             'Turnover in BEST in denars', 'Total turnover in denars', 'Volume'
         ]
         
-        for col in numeric_cols:
-            data[col] = (
-                data[col]
-                .str.replace('.', '', regex=False)
-                .str.replace(',', '.', regex=False)
-                .astype(float)
-            )
-
+        data[numeric_cols] = data[numeric_cols].astype(float)
         data['Volume'] = data['Volume'].astype(int)
         data['Date'] = pd.to_datetime(data['Date'])
         data = data.sort_values('Date', ascending=True)
@@ -126,6 +269,10 @@ class DataPreprocessor:
 # technical_analyzer.py
 class TechnicalAnalyzer:
     _instance = None
+    COLUMNS = [
+        'Date', 'Issuer', 'Avg. Price', 'Close', 'High', 'Low', '%chg.',
+        'Total turnover in denars', 'Turnover in BEST in denars', 'Volume'
+    ]
 
     def __new__(cls):
         if cls._instance is None:
@@ -138,6 +285,7 @@ class TechnicalAnalyzer:
             return
             
         self.storage = DataStorage()
+        self.price_cache = PriceHistoryCache(self.storage)
         self.thresholds = {
             'RSI': {'buy': 25, 'sell': 75},
             'Stoch_%K': {'buy': 15, 'sell': 85},
@@ -152,6 +300,9 @@ class TechnicalAnalyzer:
         self.oscillator_strategy = OscillatorSignalStrategy(self.thresholds)
         self.ma_strategy = MovingAverageSignalStrategy()
         self.macd_strategy = MACDSignalStrategy()
+        # Latest-signals mode only needs the longest indicator lookback
+        self.history_rows = max(self.oscillator_factory.lookback(), self.ma_factory.lookback())
+        self.indicator_engine = IncrementalIndicatorEngine(self.storage, self.history_rows)
         self._initialized = True
 
     def generate_oscillator_signal(self, row, indicator_name):
@@ -163,44 +314,146 @@ class TechnicalAnalyzer:
     def generate_macd_signal(self, row):
         return self.macd_strategy.generate_signal(row)
 
+    def generate_oscillator_signals(self, data, indicator_name):
+        return self.oscillator_strategy.generate_signals(data[indicator_name], indicator_name)
+
+    def generate_macd_signals(self, data):
+        return self.macd_strategy.generate_signals(data)
+
     def preprocess_data(self, data):
         return DataPreprocessor.preprocess_data(data)
 
     def compute_indicators(self, data):
-        oscillators = self.oscillator_factory.create_indicator(data)
-        moving_averages = self.ma_factory.create_indicator(data)
-        
-        for indicator_name, values in oscillators.items():
-            data[indicator_name] = values
-            
-        for indicator_name, values in moving_averages.items():
+        for indicator_name, values in self.indicator_values(data).items():
             data[indicator_name] = values
             
         return data
 
-    def analyze_stock(self, issuer):
-        db = self.storage.get_by_issuer(issuer)
-        columns = [
-            'Date', 'Issuer', 'Avg. Price', 'Close', 'High', 'Low', '%chg.',
-            'Total turnover in denars', 'Turnover in BEST in denars', 'Volume'
-        ]
-        data = pd.DataFrame(db, columns=columns)
+    def indicator_values(self, data):
+        graph = IndicatorGraph(data)
+        oscillators = self.oscillator_factory.create_indicator(data, graph)
+        moving_averages = self.ma_factory.create_indicator(data, graph)
+        return {**oscillators, **moving_averages}
+
+    def analyze_stock(self, issuer, latest_only=True):
+        """
+        Latest daily, weekly and monthly signals. By default they come from the
+        issuer's incremental indicator state, or from the last history_rows rows
+        when the state cannot be used; latest_only=False uses the full history.
+        """
+        if latest_only:
+            latest = self.latest_signals(issuer)
+            if latest is None:
+                raise ValueError(f"No price data for issuer {issuer}")
+            return latest[1]
+
+        data = self.price_cache.get_history(issuer, self.COLUMNS)
+        return self.analyze_data(data)
+
+    def latest_signals(self, issuer):
+        """(last trading day, signals) of the issuer, or None when it has no rows."""
+        latest = self.indicator_engine.latest(issuer)
+        if latest is not None:
+            day, values = latest
+            return day, self.analyze_latest_values(day, values)
+
+        data = self.price_cache.get_history(issuer, self.COLUMNS, limit_last=self.history_rows)
+        if data.empty:
+            return None
+        day = pd.Timestamp(data['Date'].max()).date()
+        return day, self.analyze_data(data)
+
+    def get_signals(self, issuer):
+        """
+        Signals stored by the last refresh when they are still current, otherwise
+        computed on demand and stored.
+        """
+        signals = self.storage.get_technical_signals(issuer)
+        if signals is not None:
+            return signals
+
+        signals = self.refresh_issuer_signals(issuer)
+        if signals is None:
+            raise ValueError(f"No price data for issuer {issuer}")
+        return signals
 
-        data = self.preprocess_data(data)
-        data = self.compute_indicators(data)
+    def refresh_signals(self, issuers=None):
+        """
+        Recomputes and stores the signals of the given issuers (every issuer the
+        scraper knows by default). Returns how many were refreshed.
+        """
+        synced = self.storage.load_data()
+        refreshed = 0
+        for issuer in issuers or sorted(synced):
+            if self.refresh_issuer_signals(issuer, synced.get(issuer)) is not None:
+                refreshed += 1
+        return refreshed
+
+    def refresh_issuer_signals(self, issuer, synced_to=None):
+        # Read before computing, so the stored row is never marked newer than its input
+        synced_to = synced_to or self.storage.get_issuer_date(issuer)
+        latest = self.latest_signals(issuer)
+        if latest is None:
+            return None
+
+        day, signals = latest
+        if synced_to is not None:
+            self.storage.save_technical_signals(issuer, day, synced_to, signals)
+        return signals
 
-        oscillator_indicators = ['RSI', 'Stoch_%K', 'Williams_R', 'PPO', 'ROC', 'CCI']
-        for indicator in oscillator_indicators:
-            data[f'{indicator}_Signal'] = data.apply(
-                self.generate_oscillator_signal, indicator_name=indicator, axis=1
-            )
+    def analyze_all(self, latest_only=True):
+        """
+        Latest daily, weekly and monthly signals of every issuer, keyed by issuer,
+        from a single read of issuer_data (the last history_rows rows of each
+        issuer unless latest_only=False). Indicators are computed per issuer and
+        the signals over the combined frame.
+        """
+        limit_last = self.history_rows if latest_only else None
+        data = pd.DataFrame(self.storage.get_all_issuers_data(limit_last=limit_last), columns=self.COLUMNS)
+        if data.empty:
+            return {}
+
+        # Issuer-major order, so the per-issuer indicator frames line up with it
+        data = self.preprocess_data(data).sort_values('Issuer', kind='stable')
+        indicators = pd.concat([
+            pd.DataFrame(self.indicator_values(group))
+            for _, group in data.groupby('Issuer', sort=False)
+        ])
+        indicators.index = data.index
+        data = self.compute_signals(pd.concat([data, indicators], axis=1))
+
+        signal_columns = list(data.filter(like='_Signal').columns)
+        latest_daily = data.groupby('Issuer').tail(1).set_index('Issuer')[signal_columns]
+        latest_weekly = self.latest_period_signals(data, signal_columns, 'W')
+        latest_monthly = self.latest_period_signals(data, signal_columns, 'ME')
 
-        ma_indicators = [('Close', 'SMA_20'), ('Close', 'EMA_20'),
-                        ('Close', 'WMA_20'), ('Close', 'TRIX')]
-        for price_col, ma_col in ma_indicators:
-            data[f'{ma_col}_Signal'] = self.generate_moving_average_signal(data, price_col, ma_col)
+        return {
+            issuer: {
+                'daily': latest_daily.loc[issuer].to_dict(),
+                'weekly': latest_weekly.loc[issuer].to_dict(),
+                'monthly': latest_monthly.loc[issuer].to_dict()
+            }
+            for issuer in latest_daily.index
+        }
+
+    @staticmethod
+    def latest_period_signals(data, signal_columns, freq):
+        # Grouped equivalent of resample(freq).last().iloc[-1] for each issuer
+        periods = data.groupby(['Issuer', pd.Grouper(level='Date', freq=freq)])[signal_columns].last()
+        return periods.groupby(level='Issuer').tail(1).droplevel('Date')
 
-        data['MACD_Signal'] = data.apply(self.generate_macd_signal, axis=1)
+    def analyze_latest_values(self, day, values):
+        # A one-row frame with the columns compute_indicators would have produced
+        data = pd.DataFrame([values], index=pd.DatetimeIndex([pd.Timestamp(day)], name='Date'))
+        return self.generate_signals(data)
+
+    def analyze_data(self, data):
+        data = self.preprocess_data(data)
+        data = self.compute_indicators(data)
+        return self.generate_signals(data)
+
+    def generate_signals(self, data):
+        data = self.compute_signals(data)
 
         data_weekly = data.resample('W').last()
         data_monthly = data.resample('ME').last()
@@ -213,4 +466,17 @@ class TechnicalAnalyzer:
             'daily': latest_daily_signal.to_dict(),
             'weekly': latest_weekly_signal.to_dict(),
             'monthly': latest_monthly_signal.to_dict()
-        }
\ No newline at end of file
+        }
+
+    def compute_signals(self, data):
+        oscillator_indicators = ['RSI', 'Stoch_%K', 'Williams_R', 'PPO', 'ROC', 'CCI']
+        for indicator in oscillator_indicators:
+            data[f'{indicator}_Signal'] = self.generate_oscillator_signals(data, indicator)
+
+        ma_indicators = [('Close', 'SMA_20'), ('Close', 'EMA_20'),
+                        ('Close', 'WMA_20'), ('Close', 'TRIX')]
+        for price_col, ma_col in ma_indicators:
+            data[f'{ma_col}_Signal'] = self.generate_moving_average_signal(data, price_col, ma_col)
+
+        data['MACD_Signal'] = self.generate_macd_signals(data)
+        return data
\ No newline at end of file
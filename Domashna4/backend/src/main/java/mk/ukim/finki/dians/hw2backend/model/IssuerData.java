@@ -6,6 +6,7 @@ import lombok.AllArgsConstructor;
 import lombok.Data;
 import lombok.NoArgsConstructor;
 
+import java.math.BigDecimal;
 import java.time.LocalDate;
 
 @Entity
@@ -25,42 +26,42 @@ public class IssuerData {
     private LocalDate date;
 
     @JsonProperty("lastTradePrice")
-    private String lastTradePrice;
+    private BigDecimal lastTradePrice;
 
     @JsonProperty("maxPrice")
-    private String maxPrice;
+    private BigDecimal maxPrice;
 
     @JsonProperty("minPrice")
-    private String minPrice;
+    private BigDecimal minPrice;
 
     @JsonProperty("avgPrice")
-    private String avgPrice;
+    private BigDecimal avgPrice;
 
     @JsonProperty("percentChange")
-    private String percentChange;
+    private BigDecimal percentChange;
 
     @JsonProperty("volume")
-    private String volume;
+    private Long volume;
 
     @JsonProperty("turnoverBest")
-    private String turnoverBest;
+    private BigDecimal turnoverBest;
 
     @JsonProperty("totalTurnover")
-    private String totalTurnover;
+    private BigDecimal totalTurnover;
 
     @Override
     public String toString() {
         return "IssuerData{" +
                 "issuer='" + issuer + '\'' +
                 ", date=" + date +
-                ", lastTradePrice='" + lastTradePrice + '\'' +
-                ", maxPrice='" + maxPrice + '\'' +
-                ", minPrice='" + minPrice + '\'' +
-                ", avgPrice='" + avgPrice + '\'' +
-                ", percentChange='" + percentChange + '\'' +
-                ", volume='" + volume + '\'' +
-                ", turnoverBest='" + turnoverBest + '\'' +
-                ", totalTurnover='" + totalTurnover + '\'' +
+                ", lastTradePrice=" + lastTradePrice +
+                ", maxPrice=" + maxPrice +
+                ", minPrice=" + minPrice +
+                ", avgPrice=" + avgPrice +
+                ", percentChange=" + percentChange +
+                ", volume=" + volume +
+                ", turnoverBest=" + turnoverBest +
+                ", totalTurnover=" + totalTurnover +
                 '}';
     }
 }
\ No newline at end of file
@@ -144,6 +144,13 @@ public class StockController {
         return ResponseEntity.ok(response.getBody());
     }
 
+    @GetMapping("/lstm")
+    public ResponseEntity<?> getLSTMAll(@RequestParam(required = false) String issuers) {
+        String pythonLSTMUrl = analyzer_url + "/api/lstm" + (issuers != null ? "?issuers=" + issuers : "");
+        ResponseEntity<String> response = restTemplate.getForEntity(pythonLSTMUrl, String.class);
+        return ResponseEntity.ok(response.getBody());
+    }
+
     @GetMapping("/lstm/{issuer}")
     public ResponseEntity<?> getLSTM(@PathVariable String issuer) {
         String pythonLSTMUrl = analyzer_url + "/api/lstm/" + issuer;
@@ -151,6 +158,13 @@ public class StockController {
         return ResponseEntity.ok(response.getBody());
     }
 
+    @GetMapping("/technical")
+    public ResponseEntity<?> getTechnicalAll() {
+        String pythonTechnicalUrl = analyzer_url + "/api/technical";
+        ResponseEntity<String> response = restTemplate.getForEntity(pythonTechnicalUrl, String.class);
+        return ResponseEntity.ok(response.getBody());
+    }
+
     @GetMapping("/technical/{issuer}")
     public ResponseEntity<?> getTechnical(@PathVariable String issuer) {
         String pythonTechnicalUrl = analyzer_url + "/api/technical/" + issuer;
@@ -0,0 +1,122 @@
+"""
+Times the technical indicators as computed by TechnicalAnalyzer's shared
+IndicatorGraph against building each `ta` indicator object separately (how the
+factories used to work), and checks that both give the same values.
+
+    python bench_indicators.py
+    python bench_indicators.py --rows 2520 10000 --repeat 20
+
+Values are compared with a relative tolerance because the vectorized WMA and
+CCI sum in a different order than pandas' rolling apply.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "analyzer", "StockAnalyzer"))
+
+
+def reference_indicators(data: pd.DataFrame) -> dict:
+    from ta.momentum import (
+        RSIIndicator, StochasticOscillator, WilliamsRIndicator,
+        PercentagePriceOscillator, ROCIndicator
+    )
+    from ta.trend import MACD, CCIIndicator, SMAIndicator, EMAIndicator, WMAIndicator, TRIXIndicator
+
+    high, low, close = data['High'], data['Low'], data['Close']
+    return {
+        'RSI': RSIIndicator(close=close, window=14).rsi(),
+        'Stoch_%K': StochasticOscillator(high=high, low=low, close=close, window=14).stoch(),
+        'Stoch_%D': StochasticOscillator(high=high, low=low, close=close, window=14).stoch_signal(),
+        'Williams_R': WilliamsRIndicator(high=high, low=low, close=close, lbp=14).williams_r(),
+        'PPO': PercentagePriceOscillator(close=close).ppo(),
+        'PPO_Signal': PercentagePriceOscillator(close=close).ppo_signal(),
+        'ROC': ROCIndicator(close=close, window=12).roc(),
+        'CCI': CCIIndicator(high=high, low=low, close=close, window=20).cci(),
+        'SMA_20': SMAIndicator(close=close, window=20).sma_indicator(),
+        'EMA_20': EMAIndicator(close=close, window=20).ema_indicator(),
+        'WMA_20': WMAIndicator(close=close, window=20).wma(),
+        'MACD': MACD(close=close).macd(),
+        'MACD_Signal': MACD(close=close).macd_signal(),
+        'TRIX': TRIXIndicator(close=close, window=20).trix()
+    }
+
+
+def graph_indicators(analyzer, data: pd.DataFrame) -> dict:
+    from technical_analysis import IndicatorGraph
+    graph = IndicatorGraph(data)
+    return {
+        **analyzer.oscillator_factory.create_indicator(data, graph),
+        **analyzer.ma_factory.create_indicator(data, graph)
+    }
+
+
+def price_frame(rows: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 1000 * np.exp(np.cumsum(rng.normal(0, 0.015, rows)))
+    spread = np.abs(rng.normal(0, 0.01, rows))
+    return pd.DataFrame(
+        {'Close': close, 'High': close * (1 + spread), 'Low': close * (1 - spread)},
+        index=pd.bdate_range('2000-01-03', periods=rows)
+    )
+
+
+def median_ms(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def max_relative_error(expected: dict, actual: dict) -> dict:
+    errors = {}
+    for name, series in expected.items():
+        a, b = series.to_numpy(dtype=float), actual[name].to_numpy(dtype=float)
+        if not np.array_equal(np.isnan(a), np.isnan(b)):
+            errors[name] = float('inf')
+            continue
+        mask = ~np.isnan(a)
+        errors[name] = float(np.max(np.abs(a[mask] - b[mask]) / np.maximum(np.abs(a[mask]), 1e-12), initial=0))
+    return errors
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--rows", type=int, nargs="+", default=[478, 2520, 10000])
+    arg_parser.add_argument("--repeat", type=int, default=10)
+    arg_parser.add_argument("--seed", type=int, default=7)
+    arg_parser.add_argument("--tolerance", type=float, default=1e-9)
+    args = arg_parser.parse_args()
+
+    os.environ.setdefault("PRICE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "bench_indicators"))
+    from technical_analysis import TechnicalAnalyzer
+    analyzer = TechnicalAnalyzer()
+
+    failed = False
+    print(f"{'rows':>7} {'ta objects ms':>14} {'graph ms':>9} {'speedup':>8} {'max rel err':>12}")
+    for rows in args.rows:
+        data = price_frame(rows, args.seed)
+        errors = max_relative_error(reference_indicators(data), graph_indicators(analyzer, data))
+        worst = max(errors.values())
+        failed |= not worst <= args.tolerance
+
+        reference_ms = median_ms(lambda: reference_indicators(data), args.repeat)
+        graph_ms = median_ms(lambda: graph_indicators(analyzer, data), args.repeat)
+        print(f"{rows:>7} {reference_ms:>14.2f} {graph_ms:>9.2f} {reference_ms / graph_ms:>7.1f}x {worst:>12.1e}")
+        for name, error in errors.items():
+            if not error <= args.tolerance:
+                print(f"        {name}: relative error {error:.1e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""
+Offline benchmark of the scrape hot path parsers.
+
+Runs every parser against the fixtures in fixtures/ (see make_fixtures.py) and
+reports median time, rows/sec, MB/sec and peak memory per parser
+implementation. No network access is needed.
+
+    python bench_parsers.py
+    python bench_parsers.py --save baseline.json
+    python bench_parsers.py --compare baseline.json --tolerance 0.25
+
+With --compare the script exits with status 1 when a case got slower than the
+baseline by more than the tolerance. Peak memory is measured with tracemalloc,
+so it only covers allocations made through the Python allocator; lxml's C-level
+tree is not included.
+
+The script also exits with status 1 when a symbolhistory parser cannot be
+pickled (the per-issuer process pool needs that) or gives different rows than
+the reference: the BeautifulSoup parser on the well-formed fixtures, and lxml
+on symbolhistory_malformed.html, whose omitted </td> and </tr> end tags
+html.parser nests instead of implying.
+"""
+import argparse
+import json
+import os
+import pickle
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "scraper", "StockScraper"))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "analyzer", "StockAnalyzer"))
+
+from filter1 import IssuerFilter
+from news_scraper import parse_mse_article, parse_news_links, parse_seinet_document
+from stock_data_scraper import ParserFactory
+from make_fixtures import FIXTURES_DIR, HISTORY_SIZES
+from mse_pages import FIXTURE_DATE
+
+
+class BenchCase(NamedTuple):
+    name: str
+    fixture: str
+    run: Callable[[str], int]
+
+
+def _history_parser_run(parser_type: str) -> Callable[[str], int]:
+    parser = ParserFactory.create_parser(parser_type)
+    return lambda content: len(parser.parse(content, "ALK"))
+
+
+def _available_history_parsers() -> List[str]:
+    available = []
+    for parser_type in ParserFactory.PARSERS:
+        try:
+            ParserFactory.create_parser(parser_type)
+            available.append(parser_type)
+        except ImportError:
+            print(f"Skipping {parser_type} parser: backend not installed")
+    return available
+
+
+# Fixture name suffix -> parser whose rows the others must match
+HISTORY_REFERENCES = {**{size: "html" for size in HISTORY_SIZES}, "malformed": "lxml"}
+
+
+def _history_fixtures(parser_type: str) -> List[str]:
+    # html.parser nests the unclosed cells of the malformed page instead of
+    # splitting them, and takes seconds doing so, so BeautifulSoup sits it out
+    return [size for size in HISTORY_REFERENCES if not (parser_type == "html" and size == "malformed")]
+
+
+def check_history_parsers() -> List[str]:
+    mismatches = []
+    available = _available_history_parsers()
+    for parser_type in available:
+        # The per-issuer process pool ships the parser to its workers
+        try:
+            pickle.loads(pickle.dumps(ParserFactory.create_parser(parser_type)))
+        except Exception as e:
+            mismatches.append(f"{parser_type} parser cannot be pickled: {e}")
+    for size, reference in HISTORY_REFERENCES.items():
+        if reference not in available:
+            print(f"Skipping the symbolhistory_{size} check: {reference} parser not installed")
+            continue
+        with open(os.path.join(FIXTURES_DIR, f"symbolhistory_{size}.html"), "r", encoding="utf-8") as f:
+            content = f.read()
+        expected = ParserFactory.create_parser(reference).parse(content, "ALK")
+        for parser_type in available:
+            if parser_type == reference or size not in _history_fixtures(parser_type):
+                continue
+            rows = ParserFactory.create_parser(parser_type).parse(content, "ALK")
+            if rows != expected:
+                mismatches.append(
+                    f"symbolhistory_{size}: {parser_type} gave {len(rows)} rows, {reference} {len(expected)}"
+                )
+    return mismatches
+
+
+def build_cases() -> List[BenchCase]:
+    cases = [
+        BenchCase(
+            f"symbolhistory[{parser_type}]/{size}",
+            f"symbolhistory_{size}.html",
+            _history_parser_run(parser_type)
+        )
+        for parser_type in _available_history_parsers()
+        for size in _history_fixtures(parser_type)
+    ]
+
+    def news_links(content):
+        links_mse, links_seinet = parse_news_links(content, FIXTURE_DATE)
+        return len(links_mse) + len(links_seinet)
+
+    cases += [
+        BenchCase("current_schedule", "current_schedule.html",
+                  lambda content: len(IssuerFilter.parse_issuers(content))),
+        BenchCase("news_links", "mse_symbol_news.html", news_links),
+        BenchCase("mse_article", "mse_article.html",
+                  lambda content: int(bool(parse_mse_article(content)))),
+        BenchCase("seinet_document", "seinet_document.json",
+                  lambda content: int(bool(parse_seinet_document(content)))),
+    ]
+    return cases
+
+
+def measure(case: BenchCase, content: str, repeat: int) -> Dict[str, float]:
+    rows = case.run(content)
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        case.run(content)
+        timings.append(time.perf_counter() - start)
+    median = statistics.median(timings)
+
+    tracemalloc.start()
+    case.run(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    size_mb = len(content.encode("utf-8")) / 1_000_000
+    return {
+        "rows": rows,
+        "median_ms": median * 1000,
+        "rows_per_sec": rows / median if median else 0.0,
+        "mb_per_sec": size_mb / median if median else 0.0,
+        "peak_kb": peak / 1024,
+    }
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline_path: str, tolerance: float) -> List[str]:
+    with open(baseline_path, "r") as f:
+        baseline = json.load(f)
+
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        allowed = baseline[name]["median_ms"] * (1 + tolerance)
+        if result["median_ms"] > allowed:
+            regressions.append(
+                f"{name}: {result['median_ms']:.2f} ms > {allowed:.2f} ms "
+                f"(baseline {baseline[name]['median_ms']:.2f} ms)"
+            )
+    return regressions
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--repeat", type=int, default=20, help="timed runs per case")
+    arg_parser.add_argument("--filter", default="", help="only run cases whose name contains this text")
+    arg_parser.add_argument("--save", help="write the results to this JSON file")
+    arg_parser.add_argument("--compare", help="baseline JSON file to check for regressions")
+    arg_parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown against the baseline")
+    args = arg_parser.parse_args()
+
+    mismatches = check_history_parsers()
+    for mismatch in mismatches:
+        print(f"MISMATCH {mismatch}")
+
+    results = {}
+    print(f"{'case':<34}{'rows':>7}{'median ms':>12}{'rows/s':>12}{'MB/s':>9}{'peak KB':>10}")
+    for case in build_cases():
+        if args.filter not in case.name:
+            continue
+        with open(os.path.join(FIXTURES_DIR, case.fixture), "r", encoding="utf-8") as f:
+            content = f.read()
+        result = measure(case, content, args.repeat)
+        results[case.name] = result
+        print(f"{case.name:<34}{result['rows']:>7}{result['median_ms']:>12.2f}"
+              f"{result['rows_per_sec']:>12.0f}{result['mb_per_sec']:>9.2f}{result['peak_kb']:>10.0f}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions or mismatches else 0
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+Starts the analyzer service under uvicorn and measures how long it takes until
+/health answers, until a technical analysis request is served, and until each
+lazily loaded subsystem (NLP, LSTM) reports ready on /health.
+
+    python bench_startup.py --issuer ALK
+    python bench_startup.py --runs 3 --warmup ""          # load on first use only
+    python bench_startup.py --db-url postgresql://...
+
+The analyzer reads the database from DB_URL like in production; --db-url
+overrides it for the started server. A subsystem that fails to load (e.g. its
+ML stack is not installed) is reported as failed with the time it took.
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Any, Dict, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ANALYZER_DIR = os.path.join(BENCH_DIR, "..", "analyzer", "StockAnalyzer")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def get_json(url: str, timeout: float) -> Optional[Any]:
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return json.loads(response.read())
+    except (urllib.error.URLError, ConnectionError, socket.timeout):
+        return None
+
+
+def wait_for(func, timeout: float, interval: float = 0.05):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        result = func()
+        if result:
+            return result
+        time.sleep(interval)
+    return None
+
+
+def measure(args: argparse.Namespace) -> Dict[str, Any]:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    env = dict(os.environ, ANALYZER_WARMUP=args.warmup)
+    if args.db_url:
+        env["DB_URL"] = args.db_url
+
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=ANALYZER_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL if args.quiet else None
+    )
+    timings: Dict[str, Any] = {}
+    try:
+        if not wait_for(lambda: get_json(f"{base_url}/health", 1), args.timeout):
+            raise RuntimeError(f"/health did not answer within {args.timeout}s")
+        timings["health"] = time.perf_counter() - started
+
+        technical = get_json(f"{base_url}/api/technical/{args.issuer}", args.timeout)
+        timings["technical"] = time.perf_counter() - started
+        if not isinstance(technical, dict) or "error" in technical:
+            timings["technical_error"] = str(technical)[:200]
+
+        def settled():
+            health = get_json(f"{base_url}/health", 1) or {}
+            now = time.perf_counter() - started
+            for name, status in health.get("subsystems", {}).items():
+                if status["state"] in ("ready", "failed") and name not in timings:
+                    timings[name] = now
+                    timings[f"{name}_state"] = status["state"]
+                    timings[f"{name}_load"] = status["load_seconds"]
+            subsystems = health.get("subsystems", {})
+            waiting = [name for name, status in subsystems.items() if status["state"] not in ("ready", "failed")]
+            # Without warm-up the subsystems only load on request, so there is nothing to wait for
+            return subsystems and (not waiting or not args.warmup)
+
+        wait_for(settled, args.timeout, interval=0.1)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    return timings
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--issuer", default="ALK")
+    arg_parser.add_argument("--runs", type=int, default=1)
+    arg_parser.add_argument("--warmup", default="lstm,nlp", help="value of ANALYZER_WARMUP for the server")
+    arg_parser.add_argument("--db-url")
+    arg_parser.add_argument("--timeout", type=float, default=600)
+    arg_parser.add_argument("--quiet", action="store_true", help="hide the server's log output")
+    args = arg_parser.parse_args()
+
+    print(f"{'run':>4} {'health s':>9} {'technical s':>12}  subsystems (ready at s / load s)")
+    for run in range(1, args.runs + 1):
+        timings = measure(args)
+        subsystems = ", ".join(
+            f"{name} {timings[f'{name}_state']} {timings[name]:.2f}/{timings[f'{name}_load'] or 0:.2f}"
+            for name in ("nlp", "lstm") if name in timings
+        ) or "not loaded"
+        print(f"{run:>4} {timings['health']:>9.2f} {timings['technical']:>12.2f}  {subsystems}")
+        if "technical_error" in timings:
+            print(f"      technical request failed: {timings['technical_error']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+"""
+Runs the scraper pipeline end to end against the local mse.mk stand-in and
+reports throughput and per-stage timing.
+
+    python load_test.py --issuers 1000 --years 20 --latency-ms 80
+    python load_test.py --mode pool --workers 13
+    python load_test.py --server-url http://127.0.0.1:8090 --db-url postgresql://...
+
+Unless --server-url is given, mse_standin.py is started in a subprocess so the
+server does not compete with the pipeline for the GIL. Rows are kept in memory
+unless --db-url is given, in which case the scraper's DataStorage is used.
+
+Stage times are cumulative over calls, so concurrent stages (fetch) can add up
+to more than the wall time. Pool mode pickles the pipeline into the worker
+processes, so only the wall time and throughput are reported there.
+"""
+import argparse
+import asyncio
+import functools
+import os
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "scraper", "StockScraper"))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "analyzer", "StockAnalyzer"))
+
+
+class MemoryStorage:
+    """In-memory replacement for the scraper's DataStorage facade."""
+
+    def __init__(self, default_start: Optional[date] = None):
+        self.default_start = default_start
+        self.dates: Dict[str, date] = {}
+        self.rows: List[Tuple] = []
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Pool mode pickles the pipeline, and with it the storage, into the workers
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def seed(self, issuers: List[str]) -> None:
+        if self.default_start:
+            for issuer in issuers:
+                self.dates.setdefault(issuer, self.default_start)
+
+    def load_data(self) -> Dict[str, date]:
+        return dict(self.dates)
+
+    def update_issuer(self, issuer: str, last_date: Optional[datetime]) -> None:
+        with self._lock:
+            self.dates[issuer] = last_date
+
+    def get_issuer_date(self, issuer: str) -> Optional[date]:
+        return self.dates.get(issuer)
+
+    def save_issuer_data(self, data_rows: List[Tuple]) -> None:
+        with self._lock:
+            self.rows.extend(data_rows)
+
+
+class StageTimer:
+    def __init__(self):
+        self.totals: Dict[str, float] = defaultdict(float)
+        self.calls: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def _record(self, stage: str, elapsed: float) -> None:
+        with self._lock:
+            self.totals[stage] += elapsed
+            self.calls[stage] += 1
+
+    def wrap(self, obj, method_name: str, stage: str) -> None:
+        method = getattr(obj, method_name)
+
+        if asyncio.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def timed(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await method(*args, **kwargs)
+                finally:
+                    self._record(stage, time.perf_counter() - start)
+        else:
+            @functools.wraps(method)
+            def timed(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    self._record(stage, time.perf_counter() - start)
+
+        setattr(obj, method_name, timed)
+
+
+def start_standin(args) -> Tuple[subprocess.Popen, str]:
+    command = [
+        sys.executable, os.path.join(BENCH_DIR, "mse_standin.py"),
+        "--port", str(args.port), "--issuers", str(args.issuers), "--years", str(args.years),
+        "--latency-ms", str(args.latency_ms), "--error-rate", str(args.error_rate),
+    ]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    process.stdout.readline()
+    url = f"http://127.0.0.1:{args.port}"
+
+    for _ in range(50):
+        try:
+            urllib.request.urlopen(f"{url}/en/stats/current-schedule", timeout=5).read()
+            return process, url
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("The mse.mk stand-in did not start")
+
+
+def run_news_stage(server_url: str, issuers: List[str], timer: StageTimer) -> int:
+    os.environ["MSE_BASE_URL"] = server_url
+    os.environ["SEINET_DOCUMENT_URL"] = f"{server_url}/public/documents/single"
+    import news_scraper
+
+    texts = 0
+    start = time.perf_counter()
+    for issuer in issuers:
+        texts += len(news_scraper.scrape(date.today(), issuer))
+    timer.totals["news"] += time.perf_counter() - start
+    timer.calls["news"] += len(issuers)
+    return texts
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--mode", choices=["async", "pool"], default="async")
+    arg_parser.add_argument("--workers", type=int, default=13, help="process count in pool mode")
+    arg_parser.add_argument("--issuers", type=int, default=200)
+    arg_parser.add_argument("--years", type=int, default=10)
+    arg_parser.add_argument("--latency-ms", type=float, default=50.0)
+    arg_parser.add_argument("--error-rate", type=float, default=0.0)
+    arg_parser.add_argument("--port", type=int, default=8090)
+    arg_parser.add_argument("--server-url", help="use an already running stand-in")
+    arg_parser.add_argument("--db-url", help="store rows in PostgreSQL instead of memory")
+    arg_parser.add_argument("--parser", default="lxml", help="ScrapingConfig.parser backend")
+    arg_parser.add_argument("--concurrency", type=int, default=16, help="ScrapingConfig.max_concurrent_requests")
+    arg_parser.add_argument("--news-issuers", type=int, default=0, help="also scrape news for this many issuers")
+    args = arg_parser.parse_args()
+
+    if args.db_url:
+        os.environ["DB_URL"] = args.db_url
+
+    from filter1 import IssuerFilter
+    from pipeline import Pipeline
+    from stock_data_scraper import AiohttpFetcher, ScrapingConfig, StockDataScraper
+
+    process = None
+    server_url = args.server_url
+    if not server_url:
+        process, server_url = start_standin(args)
+
+    try:
+        if args.db_url:
+            from data_storage import DataStorage
+            storage = DataStorage()
+        else:
+            storage = MemoryStorage(default_start=date.today() - timedelta(days=365 * args.years))
+
+        config = ScrapingConfig(
+            base_url=f"{server_url}/mk/stats/symbolhistory",
+            parser=args.parser,
+            max_concurrent_requests=args.concurrency,
+            max_connections=args.concurrency,
+        )
+        scraper = StockDataScraper(storage, config)
+        issuer_filter = IssuerFilter(f"{server_url}/en/stats/current-schedule")
+        pipeline = Pipeline(storage, scraper, issuer_filter)
+
+        issuers = issuer_filter.get_all_issuers()
+        if isinstance(storage, MemoryStorage):
+            storage.seed(issuers)
+
+        timer = StageTimer()
+        if args.mode == "async":
+            # Instance-level wrappers cannot be pickled, so pool mode runs unwrapped
+            timer.wrap(issuer_filter, "get_all_issuers", "list issuers")
+            timer.wrap(storage, "save_issuer_data", "save")
+            scraper.async_fetcher = AiohttpFetcher(config)
+            timer.wrap(pipeline.date_checker, "get_last_data_dates", "last dates")
+            timer.wrap(scraper, "scrape_all_async", "scrape (wall)")
+            timer.wrap(scraper.async_fetcher, "fetch", "fetch")
+            timer.wrap(scraper.parser, "parse", "parse")
+
+        start = time.perf_counter()
+        if args.mode == "async":
+            pipeline.run_pipeline_async()
+            asyncio.run(scraper.async_fetcher.close())
+        else:
+            pipeline.run_pipeline(max_workers=args.workers)
+        wall = time.perf_counter() - start
+
+        news_texts = 0
+        if args.news_issuers:
+            news_texts = run_news_stage(server_url, issuers[:args.news_issuers], timer)
+
+        rows = len(storage.rows) if isinstance(storage, MemoryStorage) else None
+        requests_made = timer.calls.get("fetch")
+
+        print(f"\nmode={args.mode} issuers={args.issuers} years={args.years} "
+              f"latency={args.latency_ms}ms error_rate={args.error_rate} parser={args.parser}")
+        print(f"wall time: {wall:.2f} s")
+        print(f"issuers/s: {args.issuers / wall:.1f}")
+        if rows is not None:
+            print(f"rows: {rows} ({rows / wall:.0f} rows/s)")
+        if requests_made:
+            print(f"requests: {requests_made} ({requests_made / wall:.1f} req/s)")
+        if args.news_issuers:
+            print(f"news texts: {news_texts}")
+
+        if timer.totals:
+            print(f"\n{'stage':<16}{'calls':>8}{'total s':>10}{'avg ms':>10}")
+            for stage, total in timer.totals.items():
+                calls = timer.calls[stage]
+                print(f"{stage:<16}{calls:>8}{total:>10.2f}{total / calls * 1000:>10.2f}")
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
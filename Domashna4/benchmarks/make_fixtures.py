@@ -0,0 +1,47 @@
+"""
+Writes the offline fixtures used by bench_parsers.py into fixtures/.
+
+mse.mk is not reachable from CI, so the fixtures are rendered by mse_pages with
+fixed seeds and dates. Re-running this script reproduces them byte for byte.
+
+    python make_fixtures.py
+"""
+import os
+from datetime import timedelta
+
+from mse_pages import (
+    FIXTURE_DATE, current_schedule_page, history_rows, issuer_codes,
+    mse_article_page, seinet_document, symbol_history_page, symbol_news_page
+)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Number of calendar days in each symbolhistory window; 364 is one full request
+HISTORY_SIZES = {"small": 14, "medium": 120, "large": 364}
+
+
+def write(name: str, content: str) -> None:
+    path = os.path.join(FIXTURES_DIR, name)
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(content)
+    print(f"{name}: {len(content.encode('utf-8')) / 1024:.1f} KB")
+
+
+def main() -> None:
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+
+    for size, days in HISTORY_SIZES.items():
+        rows = history_rows("ALK", FIXTURE_DATE - timedelta(days=days), FIXTURE_DATE)
+        write(f"symbolhistory_{size}.html", symbol_history_page("ALK", rows))
+
+    rows = history_rows("ALK", FIXTURE_DATE - timedelta(days=HISTORY_SIZES["medium"]), FIXTURE_DATE)
+    write("symbolhistory_malformed.html", symbol_history_page("ALK", rows, omit_end_tags=True))
+
+    write("current_schedule.html", current_schedule_page(issuer_codes(120)))
+    write("mse_symbol_news.html", symbol_news_page("ALK", FIXTURE_DATE))
+    write("mse_article.html", mse_article_page())
+    write("seinet_document.json", seinet_document())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+"""
+Renders synthetic pages in the markup of mse.mk and api.seinet.com.mk.
+
+Only the parts the scrapers read are modelled: the symbolhistory results
+table, the current-schedule issuer links, the news lists on a symbol page, the
+MSE article body and the SEINET document JSON. The navigation filler gives the
+pages a realistic weight so parse throughput in MB/s is meaningful.
+"""
+import json
+import random
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import List, Tuple
+
+FIXTURE_DATE = date(2024, 12, 20)
+
+HISTORY_HEADERS = [
+    "Датум", "Цена на последна трансакција", "Мак.", "Мин.", "Просечна цена",
+    "%пром.", "Количина", "Промет во БЕСТ во денари", "Вкупен промет во денари"
+]
+
+
+def format_mk_number(value: float, decimals: int = 2) -> str:
+    """Formats a number the way mse.mk does, e.g. 1234.5 -> "1.234,50"."""
+    text = f"{value:,.{decimals}f}"
+    return text.replace(",", " ").replace(".", ",").replace(" ", ".")
+
+
+def issuer_codes(count: int, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    letters = "ABCDEFGHIJKLMNOPRSTUVZ"
+    codes = set()
+    while len(codes) < count:
+        codes.add("".join(rng.choice(letters) for _ in range(rng.randint(3, 5))))
+    return sorted(codes)
+
+
+@lru_cache(maxsize=1)
+def _page_chrome() -> Tuple[str, str]:
+    nav = "".join(
+        f'<li class="nav-item"><a class="nav-link" href="/en/section/{i}">Section {i}</a>'
+        f'<ul class="dropdown-menu">'
+        + "".join(f'<li><a href="/en/section/{i}/{j}">Item {i}.{j}</a></li>' for j in range(12))
+        + "</ul></li>"
+        for i in range(40)
+    )
+    footer = "".join(f'<div class="footer-col"><p>Macedonian Stock Exchange &copy; {i}</p></div>' for i in range(30))
+    return nav, footer
+
+
+def _page(title: str, body: str) -> str:
+    nav, footer = _page_chrome()
+    return (
+        "<!DOCTYPE html><html lang=\"mk\"><head><meta charset=\"utf-8\">"
+        f"<title>{title}</title>"
+        "<script>window.dataLayer = window.dataLayer || [];</script></head>"
+        f"<body><header><nav><ul class=\"navbar-nav\">{nav}</ul></nav></header>"
+        f"<main class=\"container\">{body}</main><footer>{footer}</footer></body></html>"
+    )
+
+
+def history_rows(issuer: str, from_date: date, to_date: date, seed: int = 0) -> List[List[str]]:
+    """Trading-day rows for the window, newest first like the exchange returns them."""
+    rng = random.Random(f"{issuer}-{seed}-{from_date.toordinal()}")
+    price = rng.uniform(500, 25000)
+    rows = []
+    day = from_date
+    while day <= to_date:
+        if day.weekday() < 5:
+            change = rng.gauss(0, 0.012)
+            previous = price
+            price = max(1.0, price * (1 + change))
+            if rng.random() < 0.15:
+                # No trades that day: the price cells are left empty
+                rows.append([day.strftime("%d.%m.%Y"), format_mk_number(price), "", "", format_mk_number(price),
+                             "0,00", "0", "0", "0"])
+            else:
+                volume = rng.randint(1, 5000)
+                high = price * (1 + abs(rng.gauss(0, 0.005)))
+                low = price * (1 - abs(rng.gauss(0, 0.005)))
+                turnover = volume * price
+                rows.append([
+                    day.strftime("%d.%m.%Y"), format_mk_number(price), format_mk_number(high),
+                    format_mk_number(low), format_mk_number((high + low) / 2),
+                    format_mk_number((price / previous - 1) * 100), format_mk_number(volume, 0),
+                    format_mk_number(turnover, 0), format_mk_number(turnover * 1.05, 0)
+                ])
+        day += timedelta(days=1)
+    rows.reverse()
+    return rows
+
+
+def symbol_history_page(issuer: str, rows: List[List[str]], omit_end_tags: bool = False) -> str:
+    # omit_end_tags leaves out </th>, </td> and </tr>, which HTML allows and
+    # parsers have to imply
+    cell_end, row_end = ("", "") if omit_end_tags else ("</td>", "</tr>")
+    head = "".join(f"<th>{header}" + ("" if omit_end_tags else "</th>") for header in HISTORY_HEADERS)
+    body = "".join(
+        "<tr>" + "".join(f"<td>{cell}{cell_end}" for cell in row) + f"{row_end}\n"
+        for row in rows
+    )
+    table = (
+        f'<h1>{issuer}</h1><div class="table-responsive">'
+        f'<table id="resultsTable" class="table table-bordered dataTable">'
+        f"<thead><tr>{head}{row_end}</thead><tbody>{body}</tbody></table></div>"
+    )
+    return _page(f"Историјат на цени - {issuer}", table)
+
+
+def current_schedule_page(issuers: List[str]) -> str:
+    bonds = [f"RMDEN{20 + i}" for i in range(10)]
+    rows = "".join(
+        f'<tr><td><a href="/en/symbol/{code}">{code}</a></td>'
+        f"<td>{format_mk_number(1000 + i * 13.5)}</td><td>0,00</td></tr>"
+        for i, code in enumerate(issuers + bonds)
+    )
+    table = f'<table class="table"><thead><tr><th>Code</th><th>Price</th><th>%</th></tr></thead><tbody>{rows}</tbody></table>'
+    return _page("Current schedule", table)
+
+
+def symbol_news_page(issuer: str, today: date, mse_count: int = 10, seinet_count: int = 10) -> str:
+    def news_date(i):
+        day = today - timedelta(days=i * 3)
+        return f"{day.day}/{day.month}/{day.year}"
+
+    mse_news = "".join(
+        f'<div class="tab-pane-text"><a href="/en/news/{issuer.lower()}/{news_date(i)}/announcement-{i}">'
+        f"Announcement {i} for {issuer}</a></div>"
+        for i in range(mse_count)
+    )
+    seinet_news = "".join(
+        f'<div class="container-seinet"><a href="https://seinet.com.mk/document/{90000 + i}">'
+        f'{(today - timedelta(days=i * 3)).strftime("%m/%d/%Y")} 10:00:00 AM Notification {i}</a></div>'
+        for i in range(seinet_count)
+    )
+    body = (
+        f'<h1>{issuer}</h1><div id="stockEchangeNews">{mse_news}</div>'
+        f'<div id="seiNetIssuerLatestNews">{seinet_news}</div>'
+    )
+    return _page(issuer, body)
+
+
+def _sentences(rng: random.Random, count: int) -> List[str]:
+    words = ["company", "shareholders", "dividend", "assembly", "profit", "quarter", "board",
+             "report", "revenue", "growth", "decision", "meeting", "capital", "shares"]
+    return [
+        " ".join(rng.choice(words) for _ in range(rng.randint(8, 20))).capitalize() + "."
+        for _ in range(count)
+    ]
+
+
+def mse_article_page(seed: int = 0, paragraphs: int = 8) -> str:
+    rng = random.Random(seed)
+    text = "".join(f"<p>{' '.join(_sentences(rng, 5))}</p>" for _ in range(paragraphs))
+    return _page("News", f'<div id="content">{text}</div>')
+
+
+def seinet_document(seed: int = 0, paragraphs: int = 8) -> str:
+    rng = random.Random(seed)
+    content = "<br />".join(f"<p>{' '.join(_sentences(rng, 5))}</p>" for _ in range(paragraphs))
+    return json.dumps({"data": {"id": seed, "content": content}})
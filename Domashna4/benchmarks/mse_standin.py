@@ -0,0 +1,162 @@
+"""
+Local stand-in for mse.mk and the SEINET document API.
+
+Serves synthetic symbolhistory tables, the current-schedule listing, issuer news
+pages, MSE articles and SEINET documents rendered by mse_pages. Latency, error
+rate, issuer count and history depth are configurable so the scraper can be
+load tested offline.
+
+    python mse_standin.py --issuers 1000 --years 20 --latency-ms 80 --error-rate 0.01
+
+Routes:
+    /mk/stats/symbolhistory/{issuer}?FromDate=dd.mm.yyyy&ToDate=dd.mm.yyyy
+    /en/stats/current-schedule
+    /en/symbol/{issuer}
+    /en/news/...
+    /public/documents/single/{id}
+"""
+import argparse
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+from mse_pages import (
+    current_schedule_page, history_rows, issuer_codes, mse_article_page,
+    seinet_document, symbol_history_page, symbol_news_page
+)
+
+
+@dataclass
+class StandInConfig:
+    host: str = "127.0.0.1"
+    port: int = 8090
+    issuers: int = 200
+    years: int = 10
+    latency_ms: float = 50.0
+    latency_jitter_ms: float = 20.0
+    error_rate: float = 0.0
+
+
+class StandInState:
+    def __init__(self, config: StandInConfig):
+        self.config = config
+        self.issuers = issuer_codes(config.issuers)
+        self.issuer_set = set(self.issuers)
+        self.history_start = date.today() - timedelta(days=365 * config.years)
+        self.requests = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._rng = random.Random()
+
+    def record(self, failed: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            if failed:
+                self.errors += 1
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            return self._rng.random() < self.config.error_rate
+
+    def delay(self) -> float:
+        with self._lock:
+            jitter = self._rng.uniform(-self.config.latency_jitter_ms, self.config.latency_jitter_ms)
+        return max(0.0, self.config.latency_ms + jitter) / 1000
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state: StandInState = None
+
+    def do_GET(self):
+        time.sleep(self.state.delay())
+
+        if self.state.should_fail():
+            self.state.record(failed=True)
+            self._send(503, "Service Unavailable", "text/plain")
+            return
+
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        body = self._route(parts, parse_qs(url.query))
+        self.state.record(failed=body is None)
+
+        if body is None:
+            self._send(404, "Not Found", "text/plain")
+        else:
+            self._send(200, *body)
+
+    def _route(self, parts, query) -> Optional[tuple]:
+        if parts[-3:-1] == ["stats", "symbolhistory"] and parts[-1] in self.state.issuer_set:
+            return self._symbol_history(parts[-1], query), "text/html; charset=utf-8"
+        if parts[-2:] == ["stats", "current-schedule"]:
+            return current_schedule_page(self.state.issuers), "text/html; charset=utf-8"
+        if parts[-2:-1] == ["symbol"] and parts[-1] in self.state.issuer_set:
+            return symbol_news_page(parts[-1], date.today()), "text/html; charset=utf-8"
+        if "news" in parts:
+            return mse_article_page(seed=len(self.path)), "text/html; charset=utf-8"
+        if parts[-3:-1] == ["documents", "single"]:
+            return seinet_document(seed=int(parts[-1]) if parts[-1].isdigit() else 0), "application/json"
+        return None
+
+    def _symbol_history(self, issuer, query) -> str:
+        try:
+            from_date = datetime.strptime(query["FromDate"][0], "%d.%m.%Y").date()
+            to_date = datetime.strptime(query["ToDate"][0], "%d.%m.%Y").date()
+        except (KeyError, ValueError):
+            from_date = to_date = date.today()
+
+        from_date = max(from_date, self.state.history_start)
+        rows = history_rows(issuer, from_date, to_date) if from_date <= to_date else []
+        return symbol_history_page(issuer, rows)
+
+    def _send(self, status: int, body: str, content_type: str) -> None:
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def create_server(config: StandInConfig) -> ThreadingHTTPServer:
+    handler = type("ConfiguredStandInHandler", (StandInHandler,), {"state": StandInState(config)})
+    server = ThreadingHTTPServer((config.host, config.port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--host", default=StandInConfig.host)
+    arg_parser.add_argument("--port", type=int, default=StandInConfig.port)
+    arg_parser.add_argument("--issuers", type=int, default=StandInConfig.issuers)
+    arg_parser.add_argument("--years", type=int, default=StandInConfig.years)
+    arg_parser.add_argument("--latency-ms", type=float, default=StandInConfig.latency_ms)
+    arg_parser.add_argument("--latency-jitter-ms", type=float, default=StandInConfig.latency_jitter_ms)
+    arg_parser.add_argument("--error-rate", type=float, default=StandInConfig.error_rate)
+    args = arg_parser.parse_args()
+
+    config = StandInConfig(**vars(args))
+    server = create_server(config)
+    print(f"mse.mk stand-in serving {config.issuers} issuers on http://{config.host}:{config.port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        state = server.RequestHandlerClass.state
+        print(f"Served {state.requests} requests ({state.errors} errors)")
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+Checks that TechnicalAnalyzer's latest-signals mode, which only computes over
+the last `history_rows` rows, gives the same answer as a full-history run.
+
+    python verify_latest_signals.py --issuers 50 --years 10
+    python verify_latest_signals.py --db-issuers ALK,KMB,TEL
+
+For every synthetic issuer the last value of each indicator is compared
+(relative error must stay under --tolerance), and the daily, weekly and
+monthly signals must match exactly. With --db-issuers, analyze_stock is run in
+both modes against the database pointed to by DB_URL.
+"""
+import argparse
+import os
+import sys
+import tempfile
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "analyzer", "StockAnalyzer"))
+
+COLUMNS = [
+    'Date', 'Issuer', 'Avg. Price', 'Close', 'High', 'Low', '%chg.',
+    'Total turnover in denars', 'Turnover in BEST in denars', 'Volume'
+]
+
+
+def synthetic_history(issuer: str, days: int, rng: np.random.Generator) -> pd.DataFrame:
+    """Random-walk prices with occasional flat stretches, like thinly traded issuers."""
+    returns = rng.normal(0, rng.uniform(0.005, 0.03), days)
+    returns[rng.random(days) < 0.2] = 0.0
+    close = 1000 * np.exp(np.cumsum(returns))
+    spread = np.abs(rng.normal(0, 0.01, days))
+    volume = rng.integers(0, 5000, days)
+    return pd.DataFrame({
+        'Date': pd.bdate_range('2010-01-04', periods=days),
+        'Issuer': issuer,
+        'Avg. Price': close,
+        'Close': close,
+        'High': close * (1 + spread),
+        'Low': close * (1 - spread),
+        '%chg.': np.concatenate([[0.0], np.diff(close) / close[:-1] * 100]),
+        'Total turnover in denars': close * volume,
+        'Turnover in BEST in denars': close * volume,
+        'Volume': volume
+    }, columns=COLUMNS)
+
+
+def indicator_errors(analyzer, full: pd.DataFrame, window: int) -> dict:
+    def last_values(data):
+        data = analyzer.compute_indicators(analyzer.preprocess_data(data.copy()))
+        return data.iloc[-1]
+
+    expected = last_values(full)
+    actual = last_values(full.tail(window))
+    names = list(analyzer.oscillator_factory.INDICATORS) + list(analyzer.ma_factory.INDICATORS)
+    return {
+        name: abs(actual[name] - expected[name]) / max(abs(expected[name]), 1e-12)
+        for name in names
+    }
+
+
+def verify_synthetic(analyzer, issuers: int, years: int, tolerance: float, seed: int) -> List[str]:
+    rng = np.random.default_rng(seed)
+    window = analyzer.history_rows
+    failures = []
+    worst = {}
+
+    for i in range(issuers):
+        issuer = f"SYN{i:03d}"
+        full = synthetic_history(issuer, years * 252, rng)
+
+        for name, error in indicator_errors(analyzer, full, window).items():
+            worst[name] = max(worst.get(name, 0.0), error)
+            if not error <= tolerance:
+                failures.append(f"{issuer}: {name} relative error {error:.2e}")
+
+        expected = analyzer.analyze_data(full.copy())
+        actual = analyzer.analyze_data(full.tail(window).copy())
+        if actual != expected:
+            failures.append(f"{issuer}: signals differ\n  full:   {expected}\n  latest: {actual}")
+
+    print(f"window: {window} rows, {issuers} issuers x {years * 252} rows")
+    for name, error in sorted(worst.items(), key=lambda item: -item[1]):
+        print(f"  {name:<12} max relative error {error:.2e}")
+    return failures
+
+
+def verify_database(analyzer, issuers: List[str]) -> List[str]:
+    failures = []
+    for issuer in issuers:
+        expected = analyzer.analyze_stock(issuer, latest_only=False)
+        actual = analyzer.analyze_stock(issuer, latest_only=True)
+        status = "ok" if actual == expected else "MISMATCH"
+        print(f"  {issuer:<8} {status}")
+        if actual != expected:
+            failures.append(f"{issuer}: signals differ\n  full:   {expected}\n  latest: {actual}")
+    return failures
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--issuers", type=int, default=20)
+    arg_parser.add_argument("--years", type=int, default=10)
+    arg_parser.add_argument("--seed", type=int, default=42)
+    arg_parser.add_argument("--tolerance", type=float, default=1e-4,
+                            help="largest allowed relative error of an indicator's last value")
+    arg_parser.add_argument("--db-issuers", default="",
+                            help="comma separated issuers to check against the database")
+    args = arg_parser.parse_args()
+
+    # Keep the analyzer's price cache out of the working tree
+    os.environ.setdefault("PRICE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "verify_latest_signals"))
+    from technical_analysis import TechnicalAnalyzer
+    analyzer = TechnicalAnalyzer()
+
+    failures = verify_synthetic(analyzer, args.issuers, args.years, args.tolerance, args.seed)
+    if args.db_issuers:
+        print("database:")
+        failures += verify_database(analyzer, [name for name in args.db_issuers.split(",") if name])
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    print("OK" if not failures else f"{len(failures)} failure(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
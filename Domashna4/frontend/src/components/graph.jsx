@@ -19,7 +19,7 @@ const StockPriceChart = ({issuerData}) => {
         .filter((_, index) => index % step === 0)
         .map(row => ({
             date: row['date'],
-            lastPrice: row['lastTradePrice'].replace('.', '').replace(',', '.')
+            lastPrice: Number(row['lastTradePrice'])
         }));
 
 
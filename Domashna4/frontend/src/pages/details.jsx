@@ -8,6 +8,15 @@ import "./style/details.css"
 
 const backendUrl = import.meta.env.VITE_BACKEND_URL || "http://localhost:8080";
 
+// Prices come back as plain numbers; show them the way mse.mk does ("1.234,56")
+const formatNumber = (value, decimals) =>
+    value === null || value === undefined
+        ? ''
+        : Number(value).toLocaleString('de-DE', {
+            minimumFractionDigits: decimals,
+            maximumFractionDigits: decimals,
+        });
+
 const DetailsPage = () => {
     const location = useLocation();
     const issuer = location.state?.issuer;
@@ -75,7 +84,7 @@ const DetailsPage = () => {
                                             month: '2-digit',
                                             year: 'numeric',
                                         }).replace(/\//g, '.')
-                                        : val
+                                        : formatNumber(val, index <= 5 ? 2 : 0)
                                     }
                                 </td>
                             ))}
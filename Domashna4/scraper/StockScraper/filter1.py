@@ -4,10 +4,17 @@ from bs4 import BeautifulSoup
 
 
 class IssuerFilter:
+    SCHEDULE_URL = "https://www.mse.mk/en/stats/current-schedule"
+
+    def __init__(self, schedule_url=SCHEDULE_URL):
+        self.schedule_url = schedule_url
+
+    def get_all_issuers(self):
+        resp = requests.get(self.schedule_url)
+        return self.parse_issuers(resp.text)
 
     @staticmethod
-    def get_all_issuers():
-        resp = requests.get("https://www.mse.mk/en/stats/current-schedule")
-        soup = BeautifulSoup(resp.text, "html.parser")
+    def parse_issuers(content):
+        soup = BeautifulSoup(content, "html.parser")
         codes = soup.select("tr > td > a")
         return sorted([code.text for code in codes if not re.search(r'\d', code.text)])
@@ -11,4 +11,18 @@ class DataDateChecker:
         if last_date:
             return last_date
         else:
-            return date.today() - timedelta(days=3650)
+            return self._default_start_date()
+
+    def get_last_data_dates(self, issuers):
+        """
+        Same as get_last_data_date for many issuers, loaded with a single query.
+        """
+        stored_dates = self.storage.load_data()
+        return {
+            issuer: stored_dates.get(issuer) or self._default_start_date()
+            for issuer in issuers
+        }
+
+    @staticmethod
+    def _default_start_date():
+        return date.today() - timedelta(days=3650)
@@ -8,13 +8,21 @@ class DataFetcher:
         self.storage = storage
 
     def fetch_missing_data(self, issuer, last_date):
+        """
+        New rows of the issuer since last_date, or None when it is up to date or the
+        scrape failed. Moving issuer_dates is left to the caller, after the rows are
+        saved, since readers take it as a sign that the rows are in the database.
+        """
         today = date.today()
        
         if last_date >= today:
-            return pd.DataFrame()
+            return None
+
+        result = self.scraper.scrape_issuer_data(issuer, last_date)
+        if not result.success:
+            return None
 
-        data = self.scraper.scrape_issuer_data(issuer, last_date)
-        self.storage.update_issuer(issuer, today)
+        data = result.data
 
         if data:
             new_df = pd.DataFrame(data)
@@ -1,4 +1,7 @@
+import asyncio
+
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from run_pipeline import scrape
 
@@ -11,7 +14,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# One scrape at a time; a second request waits for the running one to finish
+scrape_lock = asyncio.Lock()
+
 
 @app.get("/api/scrape")
 async def fill_data():
-    scrape()
\ No newline at end of file
+    # The scrape runs its own event loop and blocks for minutes, so it gets a
+    # worker thread and this server keeps answering other requests meanwhile
+    async with scrape_lock:
+        await run_in_threadpool(scrape)
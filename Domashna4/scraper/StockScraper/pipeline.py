@@ -1,14 +1,16 @@
+import asyncio
 import concurrent.futures
+from datetime import date
 from filter1 import IssuerFilter
 from filter2 import DataDateChecker
 from filter3 import DataFetcher
 
 
 class Pipeline:
-    def __init__(self, storage, scraper):
+    def __init__(self, storage, scraper, issuer_filter=None):
         self.storage = storage
         self.scraper = scraper
-        self.issuer_filter = IssuerFilter()
+        self.issuer_filter = issuer_filter or IssuerFilter()
         self.date_checker = DataDateChecker(self.storage)
         self.data_fetcher = DataFetcher(self.scraper, self.storage)
 
@@ -18,30 +20,64 @@ class Pipeline:
         """
         last_date = self.date_checker.get_last_data_date(issuer)
         new_data = self.data_fetcher.fetch_missing_data(issuer, last_date)
-        return new_data
+        return issuer, new_data
 
     def run_pipeline(self, max_workers=13):
         issuers = self.issuer_filter.get_all_issuers()
         with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
             results = executor.map(self.process_issuer, issuers)
 
-        for result in results:
+        today = date.today()
+        for issuer, result in results:
+            if result is None:
+                continue
             if not result.empty:
-                data_rows = [
-                    (
-                        row['Date'],
-                        row['Issuer'],
-                        row['Avg. Price'],
-                        row['Last trade price'],
-                        row['Max'],
-                        row['Min'],
-                        row['%chg.'],
-                        row['Turnover in BEST in denars'],
-                        row['Total turnover in denars'],
-                        row['Volume'],
-                    )
-                    for _, row in result.iterrows()
-                ]
+                data_rows = [self._to_row(row) for _, row in result.iterrows()]
                 self.storage.save_issuer_data(data_rows)
+            # Only after the rows are in, so readers never see a date without its rows
+            self.storage.update_issuer(issuer, today)
 
         print("Pipeline completed successfully.")
+
+    def run_pipeline_async(self):
+        """
+        Scrape all issuers from a single process. Every issuer's date windows share one
+        connection pool and are fetched concurrently on one event loop.
+        """
+        issuers = self.issuer_filter.get_all_issuers()
+        last_dates = self.date_checker.get_last_data_dates(issuers)
+
+        today = date.today()
+        start_dates = {
+            issuer: last_date
+            for issuer, last_date in last_dates.items()
+            if last_date < today
+        }
+
+        results = asyncio.run(self.scraper.scrape_all_async(start_dates))
+
+        for issuer, result in results.items():
+            if not result.success:
+                print(result.error_message)
+                continue
+
+            if result.data:
+                self.storage.save_issuer_data([self._to_row(row) for row in result.data])
+            self.storage.update_issuer(issuer, today)
+
+        print("Pipeline completed successfully.")
+
+    @staticmethod
+    def _to_row(row):
+        return (
+            row['Date'],
+            row['Issuer'],
+            row['Avg. Price'],
+            row['Last trade price'],
+            row['Max'],
+            row['Min'],
+            row['%chg.'],
+            row['Turnover in BEST in denars'],
+            row['Total turnover in denars'],
+            row['Volume'],
+        )
@@ -1,14 +1,40 @@
+import os
+
+import requests
+
 from pipeline import Pipeline
 from stock_data_scraper import StockDataScraper
 from data_storage import DataStorage
 import time
 
+# Building the stored signals of every issuer takes a while on a fresh database
+ANALYZER_REFRESH_TIMEOUT_SECONDS = 300
+
 
 def scrape():
     storage = DataStorage()
-    scraper = StockDataScraper()
+    scraper = StockDataScraper(storage)
     pipeline = Pipeline(storage, scraper)
-    pipeline.run_pipeline()
     start_time = time.time()
+    pipeline.run_pipeline_async()
     end_time = time.time()
     print(f"Execution time: {end_time - start_time:.2f} seconds")
+    refresh_analyzer()
+
+
+def refresh_analyzer():
+    """
+    Asks the analyzer to recompute its stored technical signals from the rows
+    just scraped. Until it does, the analyzer computes them on demand.
+    """
+    analyzer_url = os.getenv("ANALYZER_URL")
+    if not analyzer_url:
+        return
+
+    try:
+        response = requests.post(f"{analyzer_url}/api/technical/refresh",
+                                 timeout=ANALYZER_REFRESH_TIMEOUT_SECONDS)
+        response.raise_for_status()
+        print(f"Analyzer refresh: {response.json()}")
+    except requests.RequestException as e:
+        print(f"Error refreshing analyzer signals: {e}")
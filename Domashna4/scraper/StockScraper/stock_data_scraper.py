@@ -2,18 +2,28 @@ from dataclasses import dataclass
 from datetime import date, timedelta
 from typing import List, Dict, Optional
 from abc import ABC, abstractmethod
+from html.parser import HTMLParser
+import asyncio
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+import aiohttp
 import requests
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup
 from requests.exceptions import RequestException
 
 # Data Models
 @dataclass
 class ScrapingConfig:
     base_url: str = "https://www.mse.mk/mk/stats/symbolhistory"
+    parser: str = "lxml"
     max_days_per_request: int = 364
     retry_attempts: int = 3
     timeout_seconds: int = 30
+    max_concurrent_requests: int = 16
+    max_connections: int = 16
+    keepalive_timeout_seconds: int = 30
+    max_requests_per_host: int = 4
 
 @dataclass
 class ScrapingResult:
@@ -32,6 +42,14 @@ class DataFetcher(ABC):
     def fetch(self, url: str, params: Dict) -> Optional[str]:
         pass
 
+class AsyncDataFetcher(ABC):
+    @abstractmethod
+    async def fetch(self, url: str, params: Dict) -> Optional[str]:
+        pass
+
+    async def close(self) -> None:
+        pass
+
 # Concrete implementations
 class HTMLTableParser(DataParser):
     COLUMN_NAMES = [
@@ -44,34 +62,180 @@ class HTMLTableParser(DataParser):
         return self._parse_table(soup, issuer)
 
     def _parse_table(self, soup: BeautifulSoup, issuer: str) -> List[Dict[str, str]]:
-        results = []
         table = soup.select_one('#resultsTable > tbody')
-        
+
         if not table:
-            return results
+            return []
+
+        rows = [
+            [td.text.strip() for td in row.find_all('td')]
+            for row in table.find_all('tr')
+        ]
+        return self._build_rows(rows, issuer)
+
+    def _build_row(self, cells: List[str]) -> Optional[Dict[str, str]]:
+        if len(cells) != len(self.COLUMN_NAMES):
+            return None
+
+        row_data = dict(zip(self.COLUMN_NAMES, cells))
+        # Skip empty Max values as they indicate invalid rows
+        if not row_data['Max']:
+            return None
+
+        return row_data
 
-        for row in table.find_all('tr'):
-            row_data = self._parse_row(row)
+    def _build_rows(self, rows: List[List[str]], issuer: str) -> List[Dict[str, str]]:
+        results = []
+        for cells in rows:
+            row_data = self._build_row(cells)
             if row_data:
                 row_data['Issuer'] = issuer
                 results.append(row_data)
-
         return results
 
-    def _parse_row(self, row: Tag) -> Optional[Dict[str, str]]:
-        row_data = {}
-        cells = row.find_all('td')
-        
-        if len(cells) != len(self.COLUMN_NAMES):
-            return None
+class _ResultsTableTokenizer(HTMLParser):
+    """
+    Collects the cell texts of every row in the tbody that is a direct child of
+    the table it is fed. Expects the fragment to start at the table tag. End
+    tags that HTML lets a page omit are implied the way lxml and browsers do: a
+    <td> or <th> ends the open cell, a <tr> the open row, and </tbody> or
+    </table> both. Tables nested in a cell only contribute their text.
+    """
+    VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+                 'link', 'meta', 'source', 'track', 'wbr'}
 
-        for td, column in zip(cells, self.COLUMN_NAMES):
-            # Skip empty Max values as they indicate invalid rows
-            if column == 'Max' and not td.text.strip():
-                return None
-            row_data[column] = td.text.strip()
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows: List[List[str]] = []
+        # Open tables: the fed one is 1, so its own tbody starts at depth 1
+        self._tables = 0
+        self._in_body = False
+        self._done = False
+        self._row: Optional[List[str]] = None
+        self._cell: Optional[List[str]] = None
 
-        return row_data
+    def handle_starttag(self, tag, attrs):
+        if self._done or tag in self.VOID_TAGS:
+            return
+        if tag == 'table':
+            self._tables += 1
+        elif not self._in_body:
+            self._in_body = tag == 'tbody' and self._tables == 1
+        elif self._tables > 1:
+            return
+        elif tag == 'tr':
+            self._end_row()
+            self._row = []
+        elif tag in ('td', 'th'):
+            self._end_cell()
+            if tag == 'td' and self._row is not None:
+                self._cell = []
+
+    def handle_startendtag(self, tag, attrs):
+        pass
+
+    def handle_endtag(self, tag):
+        if self._done or tag in self.VOID_TAGS:
+            return
+        if tag == 'table':
+            self._tables -= 1
+            if self._tables <= 0:
+                self._end_row()
+                self._done = True
+        elif not self._in_body or self._tables > 1:
+            return
+        elif tag == 'td':
+            self._end_cell()
+        elif tag == 'tr':
+            self._end_row()
+        elif tag == 'tbody':
+            self._end_row()
+            self._done = True
+
+    def handle_data(self, data):
+        if self._cell is not None and not self._done:
+            self._cell.append(data)
+
+    def close(self):
+        # A fragment cut off before </tbody> still yields its last row
+        super().close()
+        if not self._done:
+            self._end_row()
+            self._done = True
+
+    def _end_cell(self):
+        if self._cell is not None:
+            self._row.append(''.join(self._cell).strip())
+            self._cell = None
+
+    def _end_row(self):
+        self._end_cell()
+        if self._row is not None:
+            self.rows.append(self._row)
+            self._row = None
+
+class StreamingTableParser(HTMLTableParser):
+    """
+    Tokenizes only the #resultsTable body instead of building a tree of the whole
+    page. Produces the same rows as HTMLTableParser.
+    """
+    _TABLE_START = re.compile(r'<table\b[^>]*\bid\s*=\s*["\']?resultsTable\b', re.IGNORECASE)
+    _BODY_END = re.compile(r'</tbody\s*>', re.IGNORECASE)
+
+    def parse(self, content: str, issuer: str) -> List[Dict[str, str]]:
+        table_start = self._TABLE_START.search(content)
+        if not table_start:
+            return []
+
+        body_end = self._BODY_END.search(content, table_start.end())
+        end = body_end.end() if body_end else len(content)
+
+        tokenizer = _ResultsTableTokenizer()
+        tokenizer.feed(content[table_start.start():end])
+        tokenizer.close()
+        return self._build_rows(tokenizer.rows, issuer)
+
+class LxmlTableParser(HTMLTableParser):
+    """
+    Reads #resultsTable > tbody from an lxml tree. lxml is imported on
+    construction so it is only required when this parser is selected.
+    """
+    def __init__(self):
+        # Fail at construction when lxml is selected but not installed. The module
+        # is not kept on the instance so the parser stays picklable for the pool.
+        import lxml.html
+
+    def parse(self, content: str, issuer: str) -> List[Dict[str, str]]:
+        from lxml import html as lxml_html
+
+        if not content or not content.strip():
+            return []
+
+        tree = lxml_html.fromstring(content)
+        bodies = tree.xpath('//*[@id="resultsTable"]/tbody')
+        if not bodies:
+            return []
+
+        rows = [
+            [td.text_content().strip() for td in row.iter('td')]
+            for row in bodies[0].iter('tr')
+        ]
+        return self._build_rows(rows, issuer)
+
+# Factory for the configured parser backend
+class ParserFactory:
+    PARSERS = {
+        'html': HTMLTableParser,
+        'streaming': StreamingTableParser,
+        'lxml': LxmlTableParser,
+    }
+
+    @staticmethod
+    def create_parser(parser_type: str = "lxml") -> DataParser:
+        parser_class = ParserFactory.PARSERS.get(parser_type.lower())
+        if parser_class is None:
+            raise ValueError(f"Unsupported parser type: {parser_type}")
+        return parser_class()
 
 class RequestsFetcher(DataFetcher):
     def __init__(self, config: ScrapingConfig):
@@ -95,6 +259,48 @@ class RequestsFetcher(DataFetcher):
                     return None
         return None
 
+class AiohttpFetcher(AsyncDataFetcher):
+    """
+    Fetches pages over a single keep-alive connection pool. The connector bounds
+    the number of open connections and the semaphore caps in-flight requests.
+    """
+    def __init__(self, config: ScrapingConfig):
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.config.max_connections,
+                keepalive_timeout=self.config.keepalive_timeout_seconds
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.config.timeout_seconds)
+            )
+            self._semaphore = asyncio.Semaphore(self.config.max_concurrent_requests)
+        return self._session
+
+    async def fetch(self, url: str, params: Dict) -> Optional[str]:
+        session = self._get_session()
+        async with self._semaphore:
+            for attempt in range(self.config.retry_attempts):
+                try:
+                    async with session.get(url, params=params) as response:
+                        response.raise_for_status()
+                        return await response.text()
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    self.logger.warning(f"Attempt {attempt + 1} failed: {str(e)}")
+            self.logger.error(f"All attempts failed for URL: {url}")
+            return None
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
 # Date range iterator for handling large date ranges
 class DateRangeIterator:
     def __init__(self, start_date: date, end_date: date, max_days: int):
@@ -124,12 +330,14 @@ class StockDataScraper:
         storage: 'DataStorage',
         config: ScrapingConfig = ScrapingConfig(),
         parser: Optional[DataParser] = None,
-        fetcher: Optional[DataFetcher] = None
+        fetcher: Optional[DataFetcher] = None,
+        async_fetcher: Optional[AsyncDataFetcher] = None
     ):
         self.storage = storage
         self.config = config
-        self.parser = parser or HTMLTableParser()
+        self.parser = parser or ParserFactory.create_parser(config.parser)
         self.fetcher = fetcher or RequestsFetcher(config)
+        self.async_fetcher = async_fetcher
         self.logger = logging.getLogger(__name__)
 
     def scrape_issuer_data(self, issuer: str, start_date: date) -> ScrapingResult:
@@ -138,8 +346,40 @@ class StockDataScraper:
         Returns a ScrapingResult containing the scraped data and status information.
         """
         url = f"{self.config.base_url}/{issuer}"
-        all_data = []
-        
+        date_ranges = list(DateRangeIterator(
+            start_date,
+            date.today(),
+            self.config.max_days_per_request
+        ))
+        max_workers = max(1, min(self.config.max_requests_per_host, len(date_ranges)))
+
+        try:
+            # The windows are independent, so they are fetched in parallel and
+            # executor.map hands the pages back in window order.
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                contents = list(executor.map(
+                    lambda period: self.fetcher.fetch(url, self._build_params(*period)),
+                    date_ranges
+                ))
+
+            return self._build_result(issuer, contents)
+
+        except Exception as e:
+            error_msg = f"Unexpected error while scraping {issuer}: {str(e)}"
+            self.logger.error(error_msg)
+            return ScrapingResult(data=[], success=False, error_message=error_msg)
+
+    async def scrape_issuer_data_async(
+        self,
+        issuer: str,
+        start_date: date,
+        fetcher: AsyncDataFetcher
+    ) -> ScrapingResult:
+        """
+        Async counterpart of scrape_issuer_data. All date windows of the issuer are
+        requested concurrently through the shared fetcher and parsed in date order.
+        """
+        url = f"{self.config.base_url}/{issuer}"
         date_ranges = DateRangeIterator(
             start_date,
             date.today(),
@@ -147,31 +387,56 @@ class StockDataScraper:
         )
 
         try:
-            for period_start, period_end in date_ranges:
-                params = {
-                    "FromDate": self._format_date(period_start),
-                    "ToDate": self._format_date(period_end),
-                }
-
-                content = self.fetcher.fetch(url, params)
-                if not content:
-                    return ScrapingResult(
-                        data=[],
-                        success=False,
-                        error_message=f"Failed to fetch data for {issuer}"
-                    )
-
-                period_data = self.parser.parse(content, issuer)
-                all_data.extend(period_data)
-
-            self._log_results(issuer, all_data)
-            return ScrapingResult(data=all_data, success=True)
+            contents = await asyncio.gather(*(
+                fetcher.fetch(url, self._build_params(period_start, period_end))
+                for period_start, period_end in date_ranges
+            ))
+
+            return self._build_result(issuer, contents)
 
         except Exception as e:
             error_msg = f"Unexpected error while scraping {issuer}: {str(e)}"
             self.logger.error(error_msg)
             return ScrapingResult(data=[], success=False, error_message=error_msg)
 
+    async def scrape_all_async(self, start_dates: Dict[str, date]) -> Dict[str, ScrapingResult]:
+        """
+        Scrapes every issuer in start_dates from its start date until today on a
+        single event loop. Returns the ScrapingResult of each issuer.
+        """
+        fetcher = self.async_fetcher or AiohttpFetcher(self.config)
+        try:
+            results = await asyncio.gather(*(
+                self.scrape_issuer_data_async(issuer, start_date, fetcher)
+                for issuer, start_date in start_dates.items()
+            ))
+        finally:
+            if fetcher is not self.async_fetcher:
+                await fetcher.close()
+
+        return dict(zip(start_dates.keys(), results))
+
+    def _build_result(self, issuer: str, contents: List[Optional[str]]) -> ScrapingResult:
+        if not all(contents):
+            return ScrapingResult(
+                data=[],
+                success=False,
+                error_message=f"Failed to fetch data for {issuer}"
+            )
+
+        all_data = []
+        for content in contents:
+            all_data.extend(self.parser.parse(content, issuer))
+
+        self._log_results(issuer, all_data)
+        return ScrapingResult(data=all_data, success=True)
+
+    def _build_params(self, period_start: date, period_end: date) -> Dict[str, str]:
+        return {
+            "FromDate": self._format_date(period_start),
+            "ToDate": self._format_date(period_end),
+        }
+
     @staticmethod
     def _format_date(d: date) -> str:
         return d.strftime("%d.%m.%Y")